@@ -171,6 +171,13 @@ if __name__ == "__main__":
     
     args = parser.parse_args()
     
+    # uvloop 사용 가능 시 이벤트 루프 교체 (libuv 기반, 소켓 I/O 처리량 향상)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     # 환경변수 설정 (명령줄 인자가 있으면 덮어쓰기)
     if args.score is not None:
         os.environ['SIGNAL_SCORE_THRESHOLD'] = str(args.score)
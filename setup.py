@@ -1,20 +1,30 @@
+import os
 from setuptools import setup, find_packages
 
+# 실시간 파서를 mypyc로 C 확장 컴파일 (선택 사항: STOCK_AI_MYPYC=1)
+ext_modules = []
+if os.environ.get("STOCK_AI_MYPYC") == "1":
+    from mypyc.build import mypycify
+    ext_modules = mypycify(["src/api/_rt_parser.py"])
+
 setup(
     name="stock-ai",
     version="1.0.0",
     description="한국투자증권 KIS API 기반 주식 자동매매 시스템",
     packages=find_packages(),
+    ext_modules=ext_modules,
     python_requires=">=3.8",
     install_requires=[
         "aiohttp>=3.8.0",
         "websockets>=10.0",
         "python-dotenv>=0.19.0",
         "pycryptodome>=3.15.0",
+        "numpy>=1.20.0",
     ],
     extras_require={
         "analysis": ["pandas>=1.3.0"],
         "dev": ["pytest>=6.0.0", "black", "flake8"],
+        "speedups": ["orjson>=3.8.0", "uvloop>=0.17.0; sys_platform != 'win32'", "cryptography>=3.1", "numba>=0.56"],
     },
     classifiers=[
         "Development Status :: 4 - Beta",
@@ -41,7 +41,7 @@ class ValuationAnalyzer:
         try:
             # 캐시 확인 (강제 새로고침이 아닌 경우)
             if not force_refresh and self._is_cache_valid(stock_code):
-                logger.debug(f"Using cached valuation data for {stock_code}")
+                logger.debug("Using cached valuation data for %s", stock_code)
                 return self.metrics_cache[stock_code]
             
             logger.info(f"📊 Fetching valuation metrics for {stock_code}")
@@ -67,33 +67,28 @@ class ValuationAnalyzer:
                 current_price=current_price
             )
             
-            # PBR 계산 (캐싱 적용)
-            metrics.pbr = await self.api_client.get_pbr_cached(stock_code)
-
-            # PER 계산 (캐싱 적용)
-            metrics.per = await self.api_client.get_per_cached(stock_code)
-
-            # ROE 계산 (캐싱 적용)
-            metrics.roe = await self.api_client.get_roe_cached(stock_code)
-
-            # PSR 계산 (캐싱 적용)
-            metrics.psr = await self.api_client.get_psr_cached(stock_code)
+            # PBR/PER/ROE/PSR 계산 (캐싱 적용, 4개 지표 동시 조회)
+            indicators = await self.api_client.get_all_indicators_cached(stock_code)
+            metrics.pbr = indicators['pbr']
+            metrics.per = indicators['per']
+            metrics.roe = indicators['roe']
+            metrics.psr = indicators['psr']
             
             # 시가총액 계산 (대략적)
             try:
                 shares_outstanding = float(output.get('lstg_st_cnt', 0))  # 상장주식수
                 if shares_outstanding > 0:
                     metrics.market_cap = current_price * shares_outstanding
-            except:
+            except (ValueError, TypeError):
                 pass
             
             # 캐시에 저장
             self.metrics_cache[stock_code] = metrics
             
-            pbr_str = f"{metrics.pbr:.2f}" if metrics.pbr is not None else "N/A"
-            logger.debug(f"Valuation metrics for {stock_name}({stock_code}): "
-                        f"PBR={pbr_str}, "
-                        f"Price={current_price:,.0f}원")
+            if logger.isEnabledFor(logging.DEBUG):
+                pbr_str = f"{metrics.pbr:.2f}" if metrics.pbr is not None else "N/A"
+                logger.debug("Valuation metrics for %s(%s): PBR=%s, Price=%s원",
+                             stock_name, stock_code, pbr_str, f"{current_price:,.0f}")
             
             return metrics
             
@@ -129,16 +124,16 @@ class ValuationAnalyzer:
                         logger.warning(f"🚫 제외: {stock_code} - PBR 데이터 없음 (필수 데이터)")
                         continue
                     else:
-                        logger.debug(f"No PBR data for {stock_code}, skipping")
+                        logger.debug("No PBR data for %s, skipping", stock_code)
                         continue
                 
                 if min_pbr <= metrics.pbr <= max_pbr:
                     filtered_stocks.append(stock_code)
-                    logger.debug(f"✅ {metrics.stock_name}({stock_code}) "
-                               f"PBR: {metrics.pbr:.2f} - PASSED")
+                    logger.debug("✅ %s(%s) PBR: %.2f - PASSED",
+                                metrics.stock_name, stock_code, metrics.pbr)
                 else:
-                    logger.debug(f"❌ {metrics.stock_name}({stock_code}) "
-                               f"PBR: {metrics.pbr:.2f} - FILTERED OUT")
+                    logger.debug("❌ %s(%s) PBR: %.2f - FILTERED OUT",
+                                metrics.stock_name, stock_code, metrics.pbr)
                 
                 # API 호출 제한을 위한 지연
                 await asyncio.sleep(0.1)
@@ -166,16 +161,16 @@ class ValuationAnalyzer:
                         logger.warning(f"🚫 제외: {stock_code} - PER 데이터 없음 (필수 데이터)")
                         continue
                     else:
-                        logger.debug(f"No PER data for {stock_code}, skipping")
+                        logger.debug("No PER data for %s, skipping", stock_code)
                         continue
                 
                 if min_per <= metrics.per <= max_per:
                     filtered_stocks.append(stock_code)
-                    logger.debug(f"✅ {metrics.stock_name}({stock_code}) "
-                               f"PER: {metrics.per:.2f} - PASSED")
+                    logger.debug("✅ %s(%s) PER: %.2f - PASSED",
+                                metrics.stock_name, stock_code, metrics.per)
                 else:
-                    logger.debug(f"❌ {metrics.stock_name}({stock_code}) "
-                               f"PER: {metrics.per:.2f} - FILTERED OUT")
+                    logger.debug("❌ %s(%s) PER: %.2f - FILTERED OUT",
+                                metrics.stock_name, stock_code, metrics.per)
                 
                 # API 호출 제한을 위한 지연
                 await asyncio.sleep(0.1)
@@ -202,16 +197,16 @@ class ValuationAnalyzer:
                         logger.warning(f"🚫 제외: {stock_code} - ROE 데이터 없음 (필수 데이터)")
                         continue
                     else:
-                        logger.debug(f"No ROE data for {stock_code}, skipping")
+                        logger.debug("No ROE data for %s, skipping", stock_code)
                         continue
                 
                 if metrics.roe >= min_roe:
                     filtered_stocks.append(stock_code)
-                    logger.debug(f"✅ {metrics.stock_name}({stock_code}) "
-                               f"ROE: {metrics.roe:.2f}% - PASSED")
+                    logger.debug("✅ %s(%s) ROE: %.2f%% - PASSED",
+                                metrics.stock_name, stock_code, metrics.roe)
                 else:
-                    logger.debug(f"❌ {metrics.stock_name}({stock_code}) "
-                               f"ROE: {metrics.roe:.2f}% - FILTERED OUT")
+                    logger.debug("❌ %s(%s) ROE: %.2f%% - FILTERED OUT",
+                                metrics.stock_name, stock_code, metrics.roe)
                 
                 # API 호출 제한을 위한 지연
                 await asyncio.sleep(0.1)
@@ -238,16 +233,16 @@ class ValuationAnalyzer:
                         logger.warning(f"🚫 제외: {stock_code} - PSR 데이터 없음 (필수 데이터)")
                         continue
                     else:
-                        logger.debug(f"No PSR data for {stock_code}, skipping")
+                        logger.debug("No PSR data for %s, skipping", stock_code)
                         continue
                 
                 if metrics.psr <= max_psr:
                     filtered_stocks.append(stock_code)
-                    logger.debug(f"✅ {metrics.stock_name}({stock_code}) "
-                               f"PSR: {metrics.psr:.2f} - PASSED")
+                    logger.debug("✅ %s(%s) PSR: %.2f - PASSED",
+                                metrics.stock_name, stock_code, metrics.psr)
                 else:
-                    logger.debug(f"❌ {metrics.stock_name}({stock_code}) "
-                               f"PSR: {metrics.psr:.2f} - FILTERED OUT")
+                    logger.debug("❌ %s(%s) PSR: %.2f - FILTERED OUT",
+                                metrics.stock_name, stock_code, metrics.psr)
                 
                 # API 호출 제한을 위한 지연
                 await asyncio.sleep(0.1)
@@ -274,32 +269,32 @@ class ValuationAnalyzer:
                 pbr_score = self._calculate_pbr_score(metrics.pbr)
                 score += pbr_score * 1.0  # PBR 가중치
                 total_weight += 1.0
-                logger.debug(f"PBR score for {stock_code}: {pbr_score:.1f} (PBR: {metrics.pbr:.2f})")
+                logger.debug("PBR score for %s: %.1f (PBR: %.2f)", stock_code, pbr_score, metrics.pbr)
             
             # PER 점수 (적정 범위가 좋음)
             if metrics.per is not None:
                 per_score = self._calculate_per_score(metrics.per)
                 score += per_score * 0.8  # PER 가중치
                 total_weight += 0.8
-                logger.debug(f"PER score for {stock_code}: {per_score:.1f} (PER: {metrics.per:.2f})")
+                logger.debug("PER score for %s: %.1f (PER: %.2f)", stock_code, per_score, metrics.per)
             
             # ROE 점수 (높을수록 좋음)
             if metrics.roe is not None:
                 roe_score = self._calculate_roe_score(metrics.roe)
                 score += roe_score * 0.6  # ROE 가중치
                 total_weight += 0.6
-                logger.debug(f"ROE score for {stock_code}: {roe_score:.1f} (ROE: {metrics.roe:.2f}%)")
+                logger.debug("ROE score for %s: %.1f (ROE: %.2f%%)", stock_code, roe_score, metrics.roe)
             
             # PSR 점수 (낮을수록 좋음)
             if metrics.psr is not None:
                 psr_score = self._calculate_psr_score(metrics.psr)
                 score += psr_score * 0.4  # PSR 가중치
                 total_weight += 0.4
-                logger.debug(f"PSR score for {stock_code}: {psr_score:.1f} (PSR: {metrics.psr:.2f})")
+                logger.debug("PSR score for %s: %.1f (PSR: %.2f)", stock_code, psr_score, metrics.psr)
             
             if total_weight > 0:
                 final_score = score / total_weight
-                logger.debug(f"Final valuation score for {stock_code}: {final_score:.1f}")
+                logger.debug("Final valuation score for %s: %.1f", stock_code, final_score)
                 return final_score
             
             return 0.0
@@ -0,0 +1,60 @@
+"""
+PBR/PER/ROE/PSR 일괄 계산 Numba 커널
+compute_ratios_bulk()의 배열 연산을 한 번의 루프로 합쳐 중간 배열 생성 없이 계산
+
+numba가 설치되어 있지 않으면 import 시 ImportError가 발생하며,
+api_client는 NumPy 구현으로 대체한다. (설치: pip install numba)
+"""
+import math
+
+from numba import njit, prange
+
+# NaN 판정에 의존하므로 fastmath 플래그 중 nnan/ninf는 제외
+_FASTMATH_FLAGS = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+# 시그니처를 지정해 import 시점에 컴파일 (cache=True로 컴파일 결과를 디스크에 재사용)
+_SIGNATURE = "void(" + ", ".join(["float64[::1]"] * 13) + ")"
+
+
+@njit(_SIGNATURE, parallel=True, fastmath=_FASTMATH_FLAGS, cache=True)
+def compute_ratios_kernel(prices, eps, bps, sps, net_income, equity, shares, revenue,
+                          bounds, out_pbr, out_per, out_roe, out_psr):
+    """종목별 PBR/PER/ROE/PSR 계산 (계산 불가 또는 범위 밖이면 NaN)
+
+    bounds: [PBR 하한, PBR 상한, PER 하한, PER 상한, ROE 하한, ROE 상한, PSR 하한, PSR 상한]
+    """
+    nan = math.nan
+    for i in prange(prices.shape[0]):
+        price = prices[i]
+        has_price = price > 0
+
+        value = nan
+        if has_price and bps[i] > 0:
+            value = price / bps[i]
+            if value < bounds[0] or value > bounds[1]:
+                value = nan
+        out_pbr[i] = value
+
+        value = nan
+        if has_price and eps[i] > 0:
+            value = price / eps[i]
+            if value < bounds[2] or value > bounds[3]:
+                value = nan
+        out_per[i] = value
+
+        value = nan
+        if not math.isnan(net_income[i]) and equity[i] > 0:
+            value = net_income[i] * 100 / equity[i]
+            if value < bounds[4] or value > bounds[5]:
+                value = nan
+        out_roe[i] = value
+
+        # PSR: 주당매출액 우선, 없으면 시가총액 / 매출액
+        value = nan
+        if has_price and sps[i] > 0:
+            value = price / sps[i]
+        elif has_price and shares[i] > 0 and revenue[i] > 0:
+            value = price * shares[i] / revenue[i]
+        if value < bounds[6] or value > bounds[7]:
+            value = nan
+        out_psr[i] = value
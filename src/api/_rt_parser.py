@@ -0,0 +1,116 @@
+"""
+실시간 체결 데이터 파서
+KIS WebSocket 파이프(|) 구분 실시간 메시지 파싱
+
+메시지마다 호출되는 경로라 정적 타입 힌트만 사용하며, mypyc로 C 확장 컴파일이 가능하다.
+(setup.py 참고: STOCK_AI_MYPYC=1 환경변수로 빌드)
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# H0STCNT0 (주식 현재가) 실시간 데이터 최소 필드 수
+H0STCNT0_MIN_FIELDS: int = 15
+
+
+def safe_int(value: str, default: int = 0) -> int:
+    """실시간 필드 정수 변환 (빈 값/변환 실패 시 기본값)"""
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def safe_float(value: str, default: float = 0.0) -> float:
+    """실시간 필드 실수 변환 (빈 값/변환 실패 시 기본값)"""
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+# H0STCNT0 필드 스키마: (결과 키, '^' 구분 필드 인덱스, 변환 함수)
+_H0STCNT0_SCHEMA: Tuple[Tuple[str, int, Callable[[str], Any]], ...] = (
+    ("stock_code", 0, str),
+    ("time", 1, str),
+    ("current_price", 2, safe_int),
+    ("change", 4, safe_int),
+    ("change_rate", 5, safe_float),
+    ("volume", 12, safe_int),
+    ("trade_value", 13, safe_int),
+    ("bid_price", 7, safe_int),
+    ("ask_price", 8, safe_int),
+    ("high_price", 9, safe_int),
+    ("low_price", 10, safe_int),
+    ("prev_close", 11, safe_int),
+)
+
+
+def _parse_h0stcnt0(tr_id: str, f: List[str]) -> Dict[str, Any]:
+    """H0STCNT0 필드를 인덱스로 직접 변환 (빈 값/잘못된 값이 있으면 ValueError)"""
+    return {
+        "tr_id": tr_id,
+        "stock_code": f[0],
+        "time": f[1],
+        "current_price": int(f[2]),
+        "change": int(f[4]),
+        "change_rate": float(f[5]),
+        "volume": int(f[12]),
+        "trade_value": int(f[13]),
+        "bid_price": int(f[7]),
+        "ask_price": int(f[8]),
+        "high_price": int(f[9]),
+        "low_price": int(f[10]),
+        "prev_close": int(f[11]),
+    }
+
+
+# TR_ID별 직접 변환 함수: 정상 틱은 필드별 try/except 없이 한 번에 변환하고,
+# ValueError가 나면 스키마 기반 safe_int/safe_float 변환으로 다시 처리
+_FAST_PARSERS: Dict[str, Callable[[str, List[str]], Dict[str, Any]]] = {
+    "H0STCNT0": _parse_h0stcnt0,
+}
+
+# TR_ID별 (최소 필드 수, 스키마) - 다른 TR_ID도 필요시 추가
+_SCHEMAS: Dict[str, Tuple[int, Tuple[Tuple[str, int, Callable[[str], Any]], ...]]] = {
+    "H0STCNT0": (H0STCNT0_MIN_FIELDS, _H0STCNT0_SCHEMA),
+}
+
+
+def parse_realtime_data(data_str: str) -> Optional[Dict[str, Any]]:
+    """실시간 파이프 구분 데이터 파싱 (형식이 맞지 않으면 None)"""
+    # 헤더 3개 필드만 분리하고 나머지는 데이터 부분으로 유지
+    parts = data_str.split('|', 3)
+    if len(parts) < 4:
+        return None
+
+    compress_flag = parts[0]
+    tr_id = parts[1]
+    seq = parts[2]
+    data_part = parts[3]
+
+    spec = _SCHEMAS.get(tr_id)
+    if spec is not None:
+        min_fields, schema = spec
+        # 사용하는 필드까지만 분리 (나머지 필드 문자열 생성 생략)
+        fields = data_part.split('^', min_fields - 1)
+        if len(fields) >= min_fields:
+            fast_parser = _FAST_PARSERS.get(tr_id)
+            if fast_parser is not None:
+                try:
+                    return fast_parser(tr_id, fields)
+                except ValueError:
+                    pass
+            result: Dict[str, Any] = {"tr_id": tr_id}
+            for name, idx, conv in schema:
+                result[name] = conv(fields[idx])
+            return result
+
+    return {
+        "tr_id": tr_id,
+        "raw_data": data_part,
+        "compress_flag": compress_flag,
+        "seq": seq
+    }
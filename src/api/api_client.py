@@ -3,72 +3,685 @@ import aiohttp
 import websockets
 import json
 import logging
-from datetime import datetime
-from typing import Dict, Optional, List
+import re
+import time
+import functools
+import numpy as np
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple, Optional, List, Tuple, Union
 import hashlib
 import hmac
-import base64
+import binascii
 from urllib.parse import urlencode
 try:
     from Crypto.Cipher import AES
     from Crypto.Util.Padding import unpad
-    CRYPTO_AVAILABLE = True
+    PYCRYPTODOME_AVAILABLE = True
 except ImportError:
-    CRYPTO_AVAILABLE = False
+    PYCRYPTODOME_AVAILABLE = False
+try:
+    # OpenSSL EVP 기반 AES (설치되어 있으면 우선 사용)
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+    CRYPTOGRAPHY_AVAILABLE = True
+except ImportError:
+    CRYPTOGRAPHY_AVAILABLE = False
+CRYPTO_AVAILABLE = PYCRYPTODOME_AVAILABLE or CRYPTOGRAPHY_AVAILABLE
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from ..cache.financial_data_manager import FinancialDataManager
+from ..cache.response_cache import ResponseCache
+from ._rt_parser import parse_realtime_data
+try:
+    # 지표 일괄 계산 커널 (numba 설치 시에만 사용)
+    from ._ratios_numba import compute_ratios_kernel
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+if ORJSON_AVAILABLE:
+    _json_loads = orjson.loads
+    _JSONDecodeError = orjson.JSONDecodeError  # json.JSONDecodeError의 하위 클래스
+
+    def _json_dumps(obj) -> str:
+        """orjson 직렬화 (WebSocket 텍스트 프레임 전송을 위해 str 반환)"""
+        return orjson.dumps(obj).decode('utf-8')
+else:
+    _json_loads = json.loads
+    _JSONDecodeError = json.JSONDecodeError
+    _json_dumps = json.dumps
+
+def _pkcs7_unpad(data: bytes, block_size: int = 16) -> bytes:
+    """PKCS#7 패딩 제거 (패딩이 올바르지 않으면 ValueError)"""
+    pad_len = data[-1] if data else 0
+    if not 1 <= pad_len <= block_size or data[-pad_len:] != bytes((pad_len,)) * pad_len:
+        raise ValueError("Invalid PKCS#7 padding")
+    return data[:-pad_len]
+
+# 한 프레임에 연결된 JSON 객체들을 끝 위치 기준으로 차례로 파싱하기 위한 디코더 (raw_decode)
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WHITESPACE_RE = re.compile(r'\s*')
+
+
+def _split_json_objects(text: str) -> list:
+    """연결된 JSON 객체들을 순서대로 파싱 (중간에 깨진 부분이 있으면 그 앞까지만 반환)"""
+    objects = []
+    end = len(text)
+    idx = _JSON_WHITESPACE_RE.match(text, 0).end()
+    while idx < end:
+        try:
+            obj, idx = _JSON_DECODER.raw_decode(text, idx)
+        except json.JSONDecodeError:
+            if not objects:
+                raise
+            logger.debug("Dropping malformed JSON tail at offset %d", idx)
+            break
+        objects.append(obj)
+        idx = _JSON_WHITESPACE_RE.match(text, idx).end()
+    return objects
+
+# 수신 메시지 형식 판별용 상수
+_JSON_PREFIX = '{'
+_PIPE_DELIMITER = '|'
+
+# WebSocket 수신 대기 시간 및 무응답 연결 점검 기준 (초)
+_WS_RECV_TIMEOUT = 30.0
+_WS_IDLE_CHECK_SECONDS = 60.0
+_WS_PROBE_TIMEOUT = 10.0  # 유휴 상태 점검 시 ping 응답 대기 시간 (초)
+
+# 수신 큐 최대 길이 및 소비 태스크가 한 번에 꺼내 처리하는 메시지 수
+_WS_RX_QUEUE_SIZE = 10000
+_WS_RX_BATCH_SIZE = 64
+
+# websockets 연결 버퍼 설정 (최대 메시지 크기, 라이브러리 수신 프레임 큐 길이, 송신 버퍼 상한 바이트)
+_WS_MAX_MESSAGE_SIZE = 2 ** 20
+_WS_MAX_QUEUE = 1024
+_WS_WRITE_LIMIT = 2 ** 18
+
+# 구독 요청을 동시에 전송하는 종목 수 (배치 사이에는 짧게 대기)
+_WS_SUBSCRIBE_BATCH_SIZE = 10
+
+# 구독 메시지 템플릿에서 종목코드 자리를 표시하는 값
+_SUBSCRIBE_TR_KEY_PLACEHOLDER = "__TR_KEY__"
+
+# 활발한 거래 종목 조회 시 제외할 ETF/ETN 종목명 패턴 (한 번의 스캔으로 판별)
+_ETF_NAME_RE = re.compile(r"ETF|ETN|KODEX|TIGER|KBSTAR")
+
+# 요청별 고정 파라미터 템플릿 (호출 시 {**템플릿, 가변 필드}로 복사해 사용)
+_STOCK_QUOTE_PARAMS = {
+    "fid_cond_mrkt_div_code": "J",
+}
+_BALANCE_PARAMS_BASE = {
+    "AFHR_FLPR_YN": "N",
+    "OFL_YN": "",
+    "INQR_DVSN": "02",
+    "UNPR_DVSN": "01",
+    "FUND_STTL_ICLD_YN": "N",
+    "FNCG_AMT_AUTO_RDPT_YN": "N",
+    "PRCS_DVSN": "01",
+    "CTX_AREA_FK100": "",
+    "CTX_AREA_NK100": ""
+}
+_VOLUME_RANK_PARAMS = {
+    "fid_cond_mrkt_div_code": "J",
+    "fid_cond_scr_div_code": "20171",
+    "fid_input_iscd": "0000",
+    "fid_div_cls_code": "0",
+    "fid_blng_cls_code": "0",
+    "fid_trgt_cls_code": "111111111",
+    "fid_trgt_exls_cls_code": "000000",
+    "fid_input_price_1": "",
+    "fid_input_price_2": "",
+    "fid_vol_cnt": "",
+    "fid_input_date_1": ""
+}
+
+# 엔드포인트 경로 (클라이언트 생성 시 base_url과 합쳐 self._urls로 보관)
+_API_PATHS = {
+    "token": "/oauth2/tokenP",
+    "approval": "/oauth2/Approval",
+    "price": "/uapi/domestic-stock/v1/quotations/inquire-price",
+    "orderbook": "/uapi/domestic-stock/v1/quotations/inquire-asking-price-exp-ccn",
+    "order": "/uapi/domestic-stock/v1/trading/order-cash",
+    "balance": "/uapi/domestic-stock/v1/trading/inquire-balance",
+    "minute_chart": "/uapi/domestic-stock/v1/quotations/inquire-time-itemchartprice",
+    "volume_rank": "/uapi/domestic-stock/v1/quotations/volume-rank",
+    "daily_chart": "/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice",
+    "index_price": "/uapi/domestic-stock/v1/quotations/inquire-index-price",
+    "daily_price": "/uapi/domestic-stock/v1/quotations/inquire-daily-price",
+    "balance_sheet": "/uapi/domestic-stock/v1/finance/balance-sheet",
+}
+
+# 고정 요청 파라미터 (요청마다 바뀌는 값만 호출 시 덧붙임)
+_MINUTE_DATA_PARAMS = {
+    "fid_etc_cls_code": "",
+    "fid_cond_mrkt_div_code": "J",
+    "fid_pw_data_incu_yn": "Y"
+}
+_DAILY_PRICE_PARAMS = {
+    "fid_cond_mrkt_div_code": "J",
+    "fid_period_div_code": "D",  # 일봉
+    "fid_org_adj_prc": "1"       # 수정주가
+}
+_FLUCTUATION_RANK_PARAMS = {
+    "fid_cond_scr_div_code": "20173",
+    "fid_input_iscd": "0001",
+    "fid_input_cnt_1": "30",
+    "fid_prc_cls_code": "1",
+    "fid_input_price_1": "1000",  # 최소가격 1000원
+    "fid_input_price_2": "100000"  # 최대가격 100000원
+}
+
+# 시세 조회 응답 캐시 TTL (초) - 지정하지 않은 엔드포인트는 APICache 기본값(2초) 사용
+_ORDERBOOK_CACHE_TTL = 1   # 호가는 변동이 잦아 짧게 유지
+_RANKING_CACHE_TTL = 10    # 순위 데이터는 스캔 주기 내 재사용
+_OVERVIEW_MEMORY_TTL = 30  # 종목 개요는 디스크 캐시 앞단에서 메모리에 유지
+_RESPONSE_CACHE_MAX_SIZE = 2048  # 메모리 응답 캐시 최대 항목 수 (초과 시 LRU 제거)
+
+# 디스크 응답 캐시 TTL (초)
+_DAILY_PRICE_DISK_TTL = 7 * 24 * 3600       # 종료일이 지난 일봉 구간
+_FINANCIAL_DATA_DISK_TTL = 7 * 24 * 3600    # 재무제표 (분기 단위 갱신)
+_OVERVIEW_DISK_TTL = 24 * 3600              # 종목 개요 (주당 지표)
+_DAILY_PRICE_TODAY_TTL = 60                 # 당일이 포함된 일봉 구간 (메모리 캐시)
+# cleanup_cache에서 쓰는 디스크 캐시 키 접두어별 TTL (_disk_cached 호출부의 키/TTL과 일치해야 함)
+_DISK_CACHE_TTLS = (
+    ("daily:", _DAILY_PRICE_DISK_TTL),
+    ("financial:", _FINANCIAL_DATA_DISK_TTL),
+    ("overview:", _OVERVIEW_DISK_TTL),
+)
+
+# 종목 개요에 재무 데이터가 없어 지표를 계산하지 못한 종목의 재시도 대기 시간 (초)
+_NEGATIVE_RATIO_TTL = 3600
+
+# 여러 종목 지표 일괄 조회 시 동시에 처리하는 종목 수
+_INDICATOR_CONCURRENCY = 4
+
+# 여러 종목 일괄 조회용 즉시 시작 태스크 생성 함수 (Python 3.12+, 없으면 일반 gather)
+_EAGER_TASK_FACTORY = getattr(asyncio, 'eager_task_factory', None)
+
+# 액세스 토큰 만료 전 미리 갱신하는 여유 시간 및 갱신 실패 시 재시도 간격 (초)
+_TOKEN_REFRESH_MARGIN = 60
+_TOKEN_REFRESH_RETRY = 60
+
+# KIS 서버 초당 호출 한도 (모든 REST 요청 합계)
+_SERVER_RATE_LIMIT = 20
+
+# KIS 초당 거래건수 초과 응답 코드
+_RATE_LIMIT_MSG_CD = "EGW00201"
+
+# REST 커넥션 풀 설정 (최대 연결 수, 호스트당 연결 수, keep-alive 유지/요청 타임아웃 초)
+_HTTP_POOL_LIMIT = 50
+_HTTP_POOL_LIMIT_PER_HOST = 20
+_HTTP_KEEPALIVE_TIMEOUT = 60
+_HTTP_REQUEST_TIMEOUT = 10
+_HTTP_CONNECT_TIMEOUT = 3    # 연결 수립 대기 (장애 시 빠르게 실패)
+_HTTP_SOCK_READ_TIMEOUT = 5  # 응답 데이터 수신 간격 제한
+_HTTP_DNS_CACHE_TTL = 300    # KIS 호스트 DNS 조회 결과 재사용 시간
+
+# 재무비율별 응답 후보 키와 합리적 범위 (하한, 상한)
+_PBR_KEYS = ('pbr', 'per_pbr', 'stck_pbpr')
+_PBR_BOUNDS = (0.01, 15.0)
+_PER_KEYS = ('per', 'stck_per', 'per_ratio')
+_PER_BOUNDS = (0.1, 300.0)
+_ROE_KEYS = ('roe', 'stck_roe', 'return_on_equity')
+_ROE_BOUNDS = (-100.0, 150.0)
+_PSR_KEYS = ('psr', 'stck_psr', 'price_to_sales')
+_PSR_BOUNDS = (0.01, 30.0)
+
+_RATIO_SPECS = (
+    ('pbr', _PBR_KEYS, _PBR_BOUNDS),
+    ('per', _PER_KEYS, _PER_BOUNDS),
+    ('roe', _ROE_KEYS, _ROE_BOUNDS),
+    ('psr', _PSR_KEYS, _PSR_BOUNDS),
+)
+_RATIO_BOUNDS = {metric: bounds for metric, _, bounds in _RATIO_SPECS}
+# 일괄 계산 커널용 범위 배열 (PBR, PER, ROE, PSR 순서의 하한/상한)
+_RATIO_BOUNDS_ARRAY = np.array(
+    [bound for metric in ('pbr', 'per', 'roe', 'psr') for bound in _RATIO_BOUNDS[metric]],
+    dtype=np.float64
+)
+
+# 수동 계산 시 사용하는 주당 지표 필드 (현재가 / 주당 지표)
+_PER_SHARE_FIELDS = {
+    'pbr': 'bps',
+    'per': 'eps',
+    'psr': 'sps',
+}
+
+# API 응답에서 값이 없음을 나타내는 표기 (frozenset 멤버십 한 번으로 판별)
+_MISSING_VALUES = frozenset((None, '', '-'))
+# 재무비율 응답에서 값이 없거나 0으로 채워진 표기
+_RATIO_SENTINELS = frozenset((None, '', '-', '0', '0.0', '0.00', 0))
+
+
+class OverviewFields(NamedTuple):
+    """종목 개요 응답에서 추출한 재무 필드 (값이 없으면 None)"""
+    per: Optional[float]
+    pbr: Optional[float]
+    roe: Optional[float]
+    psr: Optional[float]
+    eps: Optional[float]
+    bps: Optional[float]
+    sps: Optional[float]
+    net_income: Optional[float]
+    equity: Optional[float]
+    revenue: Optional[float]
+    shares: Optional[float]
+
+
+# 종목 개요 필드별 (후보 키, 양수만 허용 여부) - 분모로 쓰이는 필드는 양수만 채택
+_OVERVIEW_FIELD_SPECS = {
+    'per': (_PER_KEYS, False),
+    'pbr': (_PBR_KEYS, False),
+    'roe': (_ROE_KEYS, False),
+    'psr': (_PSR_KEYS, False),
+    'eps': (('eps',), True),
+    'bps': (('bps',), True),
+    'sps': (('sps', 'sales_per_share'), True),
+    'net_income': (('net_income', 'ni', 'profit'), False),
+    'equity': (('equity', 'stockholders_equity', 'se'), True),
+    'revenue': (('revenue', 'sales', 'total_revenue', 'tr', 'sales_revenue'), True),
+    'shares': (('lstg_st_cnt',), True),
+}
+
+
+def _overview_value(value) -> Optional[float]:
+    """종목 개요 필드 값 변환 (값이 없거나 숫자가 아니면 None)"""
+    if value in _MISSING_VALUES:
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _positive_overview_value(value) -> Optional[float]:
+    """종목 개요 필드 값 변환 (양수가 아니면 None)"""
+    value = _overview_value(value)
+    return value if value is not None and value > 0 else None
+
+
+def _build_overview_parser(specs: Dict[str, Tuple[Tuple[str, ...], bool]]):
+    """필드 스키마로 종목 개요 output 파서 함수를 생성
+
+    후보 키 목록을 순회하는 대신 키마다 직선형 조회 코드를 만들어 한 번만 컴파일한다.
+    생성되는 코드 예:
+        eps = _positive(get('eps'))
+        sps = _positive(get('sps'))
+        if sps is None:
+            sps = _positive(get('sales_per_share'))
+    """
+    lines = ["def _parse_overview_output(output):", "    get = output.get"]
+    for name in OverviewFields._fields:
+        keys, positive_only = specs[name]
+        conv = "_positive" if positive_only else "_value"
+        lines.append(f"    {name} = {conv}(get({keys[0]!r}))")
+        for key in keys[1:]:
+            lines.append(f"    if {name} is None:")
+            lines.append(f"        {name} = {conv}(get({key!r}))")
+    lines.append(f"    return OverviewFields({', '.join(OverviewFields._fields)})")
+
+    namespace = {
+        "_value": _overview_value,
+        "_positive": _positive_overview_value,
+        "OverviewFields": OverviewFields,
+    }
+    exec(compile("\n".join(lines), "<overview_parser>", "exec"), namespace)
+    return namespace["_parse_overview_output"]
+
+
+_parse_overview_output = _build_overview_parser(_OVERVIEW_FIELD_SPECS)
+
+
+def _parse_overview_fields(overview_data: Optional[Dict]) -> Optional[OverviewFields]:
+    """종목 개요 응답의 후보 키를 한 번에 해석해 OverviewFields로 변환 (실패 응답이면 None)"""
+    if not overview_data or overview_data.get('rt_cd') != '0':
+        return None
+    output = overview_data.get('output')
+    if not isinstance(output, dict):
+        return None
+    return _parse_overview_output(output)
+
+
+def _overview_ratio(fields: Optional[OverviewFields], metric: str) -> Optional[float]:
+    """종목 개요에 포함된 재무비율 반환 (없거나 합리적 범위를 벗어나면 None)"""
+    if fields is None:
+        return None
+    value = getattr(fields, metric)
+    low, high = _RATIO_BOUNDS[metric]
+    if value is not None and low <= value <= high:
+        return value
+    return None
+
+
+def _per_share_ratio(fields: Optional[OverviewFields], current_price: Optional[float],
+                     metric: str) -> Optional[float]:
+    """현재가 / 주당 지표(BPS, EPS, SPS)로 PBR, PER, PSR 계산 (범위 밖이면 None)"""
+    if fields is None or current_price is None:
+        return None
+    per_share = getattr(fields, _PER_SHARE_FIELDS[metric])
+    if not per_share:
+        return None
+    value = current_price / per_share
+    low, high = _RATIO_BOUNDS[metric]
+    return value if low <= value <= high else None
+
+
+def _estimate_roe_from_ratios(pbr: Optional[float], per: Optional[float]) -> Optional[float]:
+    """PBR과 PER로 ROE(%) 추정 (추정 불가 또는 범위 밖이면 None)"""
+    if pbr and per and pbr > 0 and per > 0:
+        estimated_roe = (1 / per) * (1 / pbr) * 100
+        if -50.0 <= estimated_roe <= 100.0:
+            return estimated_roe
+    return None
+
+
+def _lacks_ratio_inputs(fields: Optional[OverviewFields], ratios: Dict[str, Optional[float]], metric: str) -> bool:
+    """정상 응답한 종목 개요와 재무비율 API만으로는 지표를 구할 수 없는지 여부
+
+    PBR/PER/PSR은 재무비율 API 값과 주당 지표(BPS/EPS/SPS)가 모두 없을 때,
+    ROE는 추정에 쓰는 PBR과 PER 중 하나라도 어느 경로로도 구할 수 없을 때 True.
+    """
+    if fields is None or ratios[metric] is not None:
+        return False
+    if metric == 'roe':
+        return any(_overview_ratio(fields, m) is None and _lacks_ratio_inputs(fields, ratios, m)
+                   for m in ('pbr', 'per'))
+    return getattr(fields, _PER_SHARE_FIELDS[metric]) is None
+
+
+def _parse_current_price(price_data: Optional[Dict]) -> Optional[float]:
+    """현재가 조회 응답에서 현재가를 한 번만 변환해 반환 (실패 응답이거나 양수가 아니면 None)"""
+    if not price_data or price_data.get('rt_cd') != '0':
+        return None
+    try:
+        price = float(price_data['output'].get('stck_prpr', 0))
+    except (KeyError, ValueError, TypeError, AttributeError):
+        return None
+    return price if price > 0 else None
+
+
+def _field_column(fields: List[Optional[OverviewFields]], name: str) -> np.ndarray:
+    """종목별 OverviewFields에서 한 필드를 float64 배열로 추출 (값이 없으면 NaN)"""
+    index = OverviewFields._fields.index(name)
+    return np.fromiter(
+        (np.nan if f is None or f[index] is None else f[index] for f in fields),
+        dtype=np.float64, count=len(fields)
+    )
+
+
+def _masked_divide(numerator: np.ndarray, denominator: np.ndarray, where: np.ndarray) -> np.ndarray:
+    """where가 참인 위치만 나눗셈하고 나머지는 NaN으로 채운 배열 반환"""
+    out = np.full(numerator.shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=where)
+    return out
+
+
+def compute_ratios_bulk(fields: List[Optional[OverviewFields]], prices: np.ndarray) -> Dict[str, np.ndarray]:
+    """여러 종목의 PBR/PER/ROE/PSR을 배열 연산으로 일괄 계산
+
+    fields와 prices는 같은 종목 순서로 정렬되어 있어야 하며,
+    계산할 수 없거나 합리적 범위를 벗어난 값은 NaN으로 반환한다.
+    numba가 설치되어 있으면 네 지표를 한 번의 루프로 계산하는 커널을 사용한다.
+    """
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    eps = _field_column(fields, 'eps')
+    bps = _field_column(fields, 'bps')
+    sps = _field_column(fields, 'sps')
+    net_income = _field_column(fields, 'net_income')
+    equity = _field_column(fields, 'equity')
+    revenue = _field_column(fields, 'revenue')
+    shares = _field_column(fields, 'shares')
+
+    if NUMBA_AVAILABLE:
+        ratios = {metric: np.empty(prices.shape[0]) for metric in ('pbr', 'per', 'roe', 'psr')}
+        compute_ratios_kernel(prices, eps, bps, sps, net_income, equity, shares, revenue,
+                              _RATIO_BOUNDS_ARRAY, ratios['pbr'], ratios['per'], ratios['roe'], ratios['psr'])
+        return ratios
+
+    # NaN 비교는 False이므로 값이 없는 종목은 자동으로 제외됨
+    has_price = prices > 0
+    ratios = {
+        'pbr': _masked_divide(prices, bps, has_price & (bps > 0)),
+        'per': _masked_divide(prices, eps, has_price & (eps > 0)),
+        'roe': _masked_divide(net_income * 100, equity, np.isfinite(net_income) & (equity > 0)),
+    }
+
+    # PSR: 주당매출액 우선, 없으면 시가총액 / 매출액
+    psr = _masked_divide(prices, sps, has_price & (sps > 0))
+    by_revenue = np.isnan(psr) & has_price & (shares > 0) & (revenue > 0)
+    np.divide(prices * shares, revenue, out=psr, where=by_revenue)
+    ratios['psr'] = psr
+
+    for metric, values in ratios.items():
+        low, high = _RATIO_BOUNDS[metric]
+        values[(values < low) | (values > high)] = np.nan
+
+    return ratios
+
+
+def _extract_ratio(output: Dict, keys: tuple, bounds: tuple) -> Optional[float]:
+    """후보 키 순서대로 값을 찾아 범위 내의 첫 번째 유효한 비율 반환"""
+    low, high = bounds
+    for key in keys:
+        value = output.get(key)
+        if value not in _RATIO_SENTINELS:
+            try:
+                parsed = float(value)
+            except (ValueError, TypeError):
+                continue
+            if low <= parsed <= high:
+                return parsed
+    return None
+
+
+def _ratios_from_response(financial_data: Optional[Dict]) -> Dict[str, Optional[float]]:
+    """재무비율 API 응답에서 PBR/PER/ROE/PSR 일괄 추출 (실패 응답이거나 값이 없거나 범위 밖이면 None)"""
+    ratios = {'pbr': None, 'per': None, 'roe': None, 'psr': None}
+    if not financial_data or financial_data.get('rt_cd') != '0':
+        return ratios
+
+    output = financial_data.get('output', {})
+    if not isinstance(output, dict):
+        return ratios
+
+    for metric, keys, bounds in _RATIO_SPECS:
+        ratios[metric] = _extract_ratio(output, keys, bounds)
+
+    return ratios
+
+
+def _gather_eager(coros) -> "asyncio.Future":
+    """종목별 조회 코루틴을 즉시 시작 태스크로 만들어 gather (캐시 적중처럼 대기 없이 끝나는 조회는 스케줄링 생략)
+
+    루프 전체의 태스크 팩토리는 바꾸지 않으므로 즉시 실행은 여기서 만든 태스크에만 적용되고,
+    그 안에서 만드는 태스크(_single_flight의 조회 태스크 등)는 기존처럼 다음 루프 순번에 시작된다.
+    """
+    if _EAGER_TASK_FACTORY is None:
+        return asyncio.gather(*coros)
+    loop = asyncio.get_running_loop()
+    return asyncio.gather(*(_EAGER_TASK_FACTORY(loop, coro) for coro in coros))
+
+
 class KISAPIClient:
+    # 실전/모의 서버별 공유 HTTP 세션: is_demo -> [세션, 생성한 이벤트 루프, 사용 중인 클라이언트 수]
+    # (여러 계좌/실전+모의 클라이언트가 같은 커넥션 풀과 keep-alive 연결을 재사용)
+    _shared_sessions: Dict[bool, list] = {}
+
     def __init__(self, app_key: str, app_secret: str, account_no: str, is_demo: bool = True):
         self.app_key = app_key
         self.app_secret = app_secret
         self.account_no = account_no
         self.is_demo = is_demo
+
+        # 계좌번호는 변하지 않으므로 한 번만 파싱
+        self._cano, self._acnt_prdt_cd = self._parse_account_no()
         
         self.base_url = "https://openapivts.koreainvestment.com:29443" if is_demo else "https://openapi.koreainvestment.com:9443"
         self.ws_url = "ws://ops.koreainvestment.com:21000" if is_demo else "ws://ops.koreainvestment.com:31000"
+        self._urls = {name: self.base_url + path for name, path in _API_PATHS.items()}
+        # 잔고 조회 파라미터는 계좌번호까지 모두 고정값이므로 한 번만 구성 (읽기 전용)
+        self._balance_params = MappingProxyType(
+            {**_BALANCE_PARAMS_BASE, "CANO": self._cano, "ACNT_PRDT_CD": self._acnt_prdt_cd}
+        )
         
         self.access_token = None
+        self._token_expires_at: Optional[float] = None  # monotonic 기준 만료 시각 (응답에 expires_in이 있을 때)
+        self._token_refresher: Optional[asyncio.Task] = None
         self.session = None
         self.websocket = None
+        self._ws_connected = False  # 연결/종료 이벤트에서만 갱신하는 연결 상태 캐시
         self.encryption_key = None
         self.encryption_iv = None
+        self._aes_key_bytes: Optional[bytes] = None  # 키/IV 수신 시 한 번만 패딩한 바이트
+        self._aes_iv_bytes: Optional[bytes] = None
+        self._aes_cipher = None  # cryptography Cipher (설치된 경우)
+        self._can_decrypt = False  # 라이브러리와 키/IV가 모두 준비된 경우에만 True
 
-        self.rate_limiter = asyncio.Semaphore(20)  # 초당 20회 제한
 
         # WebSocket 연결 안정성 관련 변수
         self.ws_reconnect_attempts = 0
         self.max_reconnect_attempts = 5
         self.reconnect_delay = 5  # 초
         self.is_reconnecting = False
-        self.last_heartbeat = None
+        self.last_heartbeat_ts = 0.0  # 이벤트 루프 monotonic 시각 (loop.time())
         self.heartbeat_interval = 30  # 30초마다 heartbeat
+        self._heartbeat_payload = None  # 연결 시 한 번 직렬화해 두는 heartbeat 메시지
+        self._subscribe_template: Optional[Tuple[str, str, str]] = None  # (approval key, 앞부분, 뒷부분)
+        self._rx_queue: Optional[asyncio.Queue] = None  # listen_websocket 수신 큐
 
         # 캐싱 및 폴백 로직을 위한 데이터 매니저
         self.data_manager = None
 
-    async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
-        await self.get_access_token()
+        # 일봉/재무/종목 개요 응답 디스크 캐시 (__aenter__에서 생성)
+        self._disk_cache: Optional[ResponseCache] = None
+
+        # API 호출 제한기 (모듈 최상단 import 시 src.utils 패키지 초기화가
+        # daily_report → src.analysis → src.api 순으로 이어져 순환 참조가 생기므로
+        # 인스턴스 생성 시 한 번만 가져와 바인딩 - 요청 메서드에서는 self._throttler만 사용)
+        from ..utils.api_throttler import throttler, APIThrottler, APICache
+        self._throttler = throttler
+
+        # 서버 전체 호출 한도 (모든 REST 요청에 적용, 초당 _SERVER_RATE_LIMIT회까지 연속 허용)
+        self.rate_limiter = APIThrottler(max_calls_per_second=_SERVER_RATE_LIMIT, burst=_SERVER_RATE_LIMIT)
+
+        # 같은 스캔 주기 내 중복 조회 방지용 단기 응답 캐시 (성공 응답만 저장)
+        self._response_cache = APICache(default_ttl=2, max_size=_RESPONSE_CACHE_MAX_SIZE)
+
+        # TR_ID별 요청 헤더 캐시 (get_access_token에서 토큰을 갱신하면 전체 무효화)
+        self._header_cache: Dict[Tuple[str, str], Mapping[str, str]] = {}
+
+        # 동일 종목 동시 요청 병합용 (키 -> 진행 중인 Future)
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # 지표 계산 불가 종목 캐시 ((종목코드, 지표) -> 재시도 가능 시각, monotonic 기준)
+        self._negative_ratio_cache: Dict[Tuple[str, str], float] = {}
+
+    @staticmethod
+    def _create_session() -> "aiohttp.ClientSession":
+        """keep-alive 커넥션 풀을 쓰는 HTTP 세션 생성"""
+        connector = aiohttp.TCPConnector(
+            limit=_HTTP_POOL_LIMIT,
+            limit_per_host=_HTTP_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=_HTTP_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=_HTTP_DNS_CACHE_TTL
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(
+                total=_HTTP_REQUEST_TIMEOUT,
+                connect=_HTTP_CONNECT_TIMEOUT,
+                sock_read=_HTTP_SOCK_READ_TIMEOUT
+            ),
+            json_serialize=_json_dumps
+        )
+
+    def _acquire_session(self) -> "aiohttp.ClientSession":
+        """같은 서버(실전/모의)를 쓰는 클라이언트끼리 공유하는 HTTP 세션 획득"""
+        loop = asyncio.get_running_loop()
+        entry = self._shared_sessions.get(self.is_demo)
+        # 닫혔거나 다른 이벤트 루프에서 만든 세션은 재사용할 수 없으므로 새로 생성
+        if entry is None or entry[0].closed or entry[1] is not loop:
+            entry = [self._create_session(), loop, 0]
+            self._shared_sessions[self.is_demo] = entry
+        entry[2] += 1
+        return entry[0]
+
+    async def _release_session(self):
+        """공유 HTTP 세션 반납 (마지막 사용자가 반납하면 세션 종료)"""
+        session = self.session
+        self.session = None
+        entry = self._shared_sessions.get(self.is_demo)
+        if entry is None or entry[0] is not session:
+            # 공유 목록에서 이미 빠진 세션 (aclose_all 이후 등)
+            if not session.closed:
+                await session.close()
+            return
+        entry[2] -= 1
+        if entry[2] <= 0:
+            del self._shared_sessions[self.is_demo]
+            await session.close()
+
+    @classmethod
+    async def aclose_all(cls):
+        """사용 중인 클라이언트와 관계없이 공유 HTTP 세션을 모두 종료 (애플리케이션 종료 시)"""
+        entries = list(cls._shared_sessions.values())
+        cls._shared_sessions.clear()
+        for session, _, _ in entries:
+            if not session.closed:
+                await session.close()
 
-        # 데이터 매니저 초기화
-        self.data_manager = FinancialDataManager(self)
+    async def __aenter__(self):
+        # 클라이언트 수명 동안 TCP/TLS 연결을 재사용하도록 공유 keep-alive 커넥션 풀 사용
+        self.session = self._acquire_session()
+        try:
+            await self.get_access_token()
+            self._token_refresher = asyncio.create_task(self._token_refresh_loop())
+
+            # 데이터 매니저 및 디스크 응답 캐시 초기화
+            self.data_manager = FinancialDataManager(self)
+            self._disk_cache = ResponseCache()
+        except BaseException:
+            # 초기화 실패 시 __aexit__가 호출되지 않으므로 공유 세션 사용 수를 직접 되돌림
+            if self._token_refresher is not None:
+                self._token_refresher.cancel()
+                self._token_refresher = None
+            await self._release_session()
+            raise
 
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # 토큰 갱신 태스크 정리
+        if self._token_refresher is not None:
+            self._token_refresher.cancel()
+            try:
+                await self._token_refresher
+            except asyncio.CancelledError:
+                pass
+            self._token_refresher = None
+
         # WebSocket 정리
         await self.close_websocket()
 
-        # HTTP 세션 정리
+        # HTTP 세션 반납 (다른 클라이언트가 쓰고 있으면 유지)
         if self.session:
-            await self.session.close()
+            await self._release_session()
+
+        # 디스크 응답 캐시 연결 종료
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+            self._disk_cache = None
     
     async def get_access_token(self):
         """액세스 토큰 획득"""
-        url = f"{self.base_url}/oauth2/tokenP"
+        url = self._urls['token']
         data = {
             "grant_type": "client_credentials",
             "appkey": self.app_key,
@@ -77,15 +690,32 @@ class KISAPIClient:
         
         async with self.session.post(url, json=data) as response:
             if response.status == 200:
-                result = await response.json()
+                result = await response.json(loads=_json_loads)
                 self.access_token = result.get("access_token")
+                self._header_cache.clear()
+                try:
+                    self._token_expires_at = time.monotonic() + float(result.get("expires_in"))
+                except (ValueError, TypeError):
+                    self._token_expires_at = None
                 logger.info("Access token obtained successfully")
             else:
                 logger.error(f"Failed to get access token: {response.status}")
                 raise Exception("Failed to get access token")
+
+    async def _token_refresh_loop(self):
+        """액세스 토큰을 만료 _TOKEN_REFRESH_MARGIN초 전에 백그라운드에서 갱신 (요청 경로에서 토큰 발급 대기 제거)"""
+        while self._token_expires_at is not None:
+            delay = self._token_expires_at - _TOKEN_REFRESH_MARGIN - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                await self.get_access_token()
+            except Exception as e:
+                logger.error(f"Background access token refresh failed: {e}")
+                await asyncio.sleep(_TOKEN_REFRESH_RETRY)
     
     def _parse_account_no(self):
-        """계좌번호를 안전하게 파싱"""
+        """계좌번호를 안전하게 파싱 (__init__에서 한 번 호출)"""
         try:
             if "-" in self.account_no:
                 parts = self.account_no.split("-")
@@ -108,60 +738,122 @@ class KISAPIClient:
             logger.error(f"Error parsing account_no {self.account_no}: {e}")
             return self.account_no, "01"
 
-    def _get_headers(self, tr_id: str, custtype: str = "P"):
-        """API 요청 헤더 생성"""
-        return {
-            "Content-Type": "application/json",
-            "authorization": f"Bearer {self.access_token}",
-            "appkey": self.app_key,
-            "appsecret": self.app_secret,
-            "tr_id": tr_id,
-            "custtype": custtype
-        }
+    def _get_headers(self, tr_id: str, custtype: str = "P") -> Mapping[str, str]:
+        """API 요청 헤더 생성 (TR_ID별로 캐시, 공유 객체이므로 읽기 전용 매핑으로 반환)"""
+        cache_key = (tr_id, custtype)
+        headers = self._header_cache.get(cache_key)
+        if headers is None:
+            headers = MappingProxyType({
+                "Content-Type": "application/json",
+                "authorization": f"Bearer {self.access_token}",
+                "appkey": self.app_key,
+                "appsecret": self.app_secret,
+                "tr_id": tr_id,
+                "custtype": custtype
+            })
+            self._header_cache[cache_key] = headers
+        return headers
     
-    async def _request(self, method: str, url: str, headers: Dict, data: Optional[Dict] = None):
+    async def _single_flight(self, key: str, fetch_func, *args):
+        """동일 키로 진행 중인 요청이 있으면 그 결과를 공유 (중복 네트워크 호출 방지)
+
+        조회는 별도 태스크로 실행하고 모든 호출자는 shield로 기다린다. 먼저 호출한 쪽이
+        취소(wait_for 타임아웃 등)되어도 조회는 계속 진행되어 다른 대기자는 정상 결과를 받는다.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch_func(*args))
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._finish_inflight, key))
+        return await asyncio.shield(task)
+
+    def _finish_inflight(self, key: str, task: asyncio.Future):
+        """완료된 병합 요청 정리"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # 대기자가 모두 취소된 경우의 'exception was never retrieved' 경고 방지
+
+    async def _cached_single_flight(self, key: str, fetch_func, *args, ttl: Optional[int] = None):
+        """단기 TTL 캐시 확인 후 동시 요청 병합 조회 (순차 중복은 캐시, 동시 중복은 병합으로 처리)"""
+        cached = self._response_cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = await self._single_flight(key, fetch_func, *args)
+        if result and result.get('rt_cd') == '0':
+            self._response_cache.set(key, result, ttl)
+        return result
+
+    async def _disk_cached(self, key: str, ttl: float, fetch_func, *args):
+        """디스크 응답 캐시 확인 후 조회 (성공 응답만 저장, 캐시 미초기화 시 바로 조회)"""
+        disk_cache = self._disk_cache
+        if disk_cache is None:
+            return await fetch_func(*args)
+
+        # sqlite 조회/저장은 블로킹 I/O이므로 이벤트 루프 밖(기본 executor)에서 실행
+        loop = asyncio.get_running_loop()
+        cached = await loop.run_in_executor(None, disk_cache.get, key, ttl)
+        if cached is not None:
+            return cached
+
+        result = await fetch_func(*args)
+        if result and result.get('rt_cd') == '0':
+            await loop.run_in_executor(None, disk_cache.set, key, result)
+        return result
+
+    async def _request(self, method: str, url: str, headers: Mapping[str, str], data: Optional[Dict] = None):
         """API 요청 (Rate Limiting 적용)"""
-        async with self.rate_limiter:
-            if method.upper() == "GET":
-                async with self.session.get(url, headers=headers, params=data) as response:
-                    return await response.json()
-            elif method.upper() == "POST":
-                async with self.session.post(url, headers=headers, json=data) as response:
-                    return await response.json()
+        await self.rate_limiter.throttle()
+        if method.upper() == "GET":
+            async with self.session.get(url, headers=headers, params=data) as response:
+                result = await response.json(loads=_json_loads)
+        elif method.upper() == "POST":
+            async with self.session.post(url, headers=headers, json=data) as response:
+                result = await response.json(loads=_json_loads)
+        else:
+            return None
+
+        # 서버가 초당 호출 한도 초과로 거절하면 호출 제한기에 반영해 이후 호출을 늦춤
+        if isinstance(result, dict) and result.get('msg_cd') == _RATE_LIMIT_MSG_CD:
+            self._throttler.backoff()
+            self.rate_limiter.backoff()
+        return result
     
     async def get_current_price(self, stock_code: str) -> Dict:
+        """현재가 조회 (스로틀링 + 단기 캐시 + 동시 요청 병합 적용)"""
+        return await self._cached_single_flight(f"price:{stock_code}", self._fetch_current_price, stock_code)
+
+    async def _fetch_current_price(self, stock_code: str) -> Dict:
         """현재가 조회 (스로틀링 적용)"""
         # API 호출 제한 적용
-        from ..utils.api_throttler import throttler
-        await throttler.throttle()
+        await self._throttler.throttle()
         
-        url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/inquire-price"
+        url = self._urls['price']
         headers = self._get_headers("FHKST01010100")
-        params = {
-            "fid_cond_mrkt_div_code": "J",
-            "fid_input_iscd": stock_code
-        }
+        params = {**_STOCK_QUOTE_PARAMS, "fid_input_iscd": stock_code}
         
         return await self._request("GET", url, headers, params)
     
     async def get_orderbook(self, stock_code: str) -> Dict:
+        """호가 정보 조회 (단기 캐시 + 동시 요청 병합 적용)"""
+        return await self._cached_single_flight(f"orderbook:{stock_code}", self._fetch_orderbook, stock_code,
+                                                ttl=_ORDERBOOK_CACHE_TTL)
+
+    async def _fetch_orderbook(self, stock_code: str) -> Dict:
         """호가 정보 조회"""
-        url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/inquire-asking-price-exp-ccn"
+        url = self._urls['orderbook']
         headers = self._get_headers("FHKST01010200")
-        params = {
-            "fid_cond_mrkt_div_code": "J",
-            "fid_input_iscd": stock_code
-        }
+        params = {**_STOCK_QUOTE_PARAMS, "fid_input_iscd": stock_code}
         
         return await self._request("GET", url, headers, params)
     
     async def place_order(self, stock_code: str, order_type: str, quantity: int, price: int = 0) -> Dict:
         """주문 실행 (스로틀링 적용)"""
         # API 호출 제한 적용
-        from ..utils.api_throttler import throttler
-        await throttler.throttle()
+        await self._throttler.throttle()
         
-        url = f"{self.base_url}/uapi/domestic-stock/v1/trading/order-cash"
+        url = self._urls['order']
         
         tr_id = "VTTC0802U" if order_type == "buy" else "VTTC0801U"  # 모의투자
         if not self.is_demo:
@@ -169,14 +861,14 @@ class KISAPIClient:
             
         headers = self._get_headers(tr_id)
         
-        # 계좌번호 안전하게 파싱
-        cano, acnt_prdt_cd = self._parse_account_no()
+        # 계좌번호 (초기화 시 파싱된 값 사용)
+        cano, acnt_prdt_cd = self._cano, self._acnt_prdt_cd
         
         data = {
             "CANO": cano,
             "ACNT_PRDT_CD": acnt_prdt_cd,
             "PDNO": stock_code,
-            "ORD_DVSN": "01" if price > 0 else "01",  # 01: 지정가, 01: 시장가
+            "ORD_DVSN": "01",  # 01: 시장가 (AutoTrader는 체결을 전제로 포지션을 갱신하므로 항상 시장가)
             "ORD_QTY": str(quantity),
             "ORD_UNPR": str(price) if price > 0 else "0"
         }
@@ -184,73 +876,62 @@ class KISAPIClient:
         return await self._request("POST", url, headers, data)
     
     async def get_balance(self) -> Dict:
+        """잔고 조회 (동시 요청 병합 적용, 잔고는 주문 직후 바뀌므로 캐시하지 않음)"""
+        return await self._single_flight("balance", self._fetch_balance)
+
+    async def _fetch_balance(self) -> Dict:
         """잔고 조회 (스로틀링 적용)"""
         # API 호출 제한 적용
-        from ..utils.api_throttler import throttler
-        await throttler.throttle()
+        await self._throttler.throttle()
         
-        url = f"{self.base_url}/uapi/domestic-stock/v1/trading/inquire-balance"
+        url = self._urls['balance']
         headers = self._get_headers("VTTC8434R" if self.is_demo else "TTTC8434R")
         
-        # 계좌번호 안전하게 파싱
-        cano, acnt_prdt_cd = self._parse_account_no()
-        
-        params = {
-            "CANO": cano,
-            "ACNT_PRDT_CD": acnt_prdt_cd,
-            "AFHR_FLPR_YN": "N",
-            "OFL_YN": "",
-            "INQR_DVSN": "02",
-            "UNPR_DVSN": "01",
-            "FUND_STTL_ICLD_YN": "N",
-            "FNCG_AMT_AUTO_RDPT_YN": "N",
-            "PRCS_DVSN": "01",
-            "CTX_AREA_FK100": "",
-            "CTX_AREA_NK100": ""
-        }
-        
-        return await self._request("GET", url, headers, params)
+        return await self._request("GET", url, headers, self._balance_params)
     
     async def get_minute_data(self, stock_code: str, period: str = "1") -> Dict:
         """분봉 데이터 조회"""
-        url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/inquire-time-itemchartprice"
+        url = self._urls['minute_chart']
         headers = self._get_headers("FHKST03010200")
-        params = {
-            "fid_etc_cls_code": "",
-            "fid_cond_mrkt_div_code": "J",
-            "fid_input_iscd": stock_code,
-            "fid_input_hour_1": period,
-            "fid_pw_data_incu_yn": "Y"
-        }
+        params = {**_MINUTE_DATA_PARAMS, "fid_input_iscd": stock_code, "fid_input_hour_1": period}
         
         return await self._request("GET", url, headers, params)
     
+    async def get_stock_bundle(self, stock_code: str, period: str = "1") -> Dict[str, Dict]:
+        """현재가/호가/분봉 동시 조회 (호출 제한은 각 요청의 토큰 버킷이 그대로 적용)
+
+        실패한 조회는 예외 대신 {"rt_cd": "1", "msg1": ...} 형태로 담아 나머지 결과는 그대로 반환
+        """
+        results = await asyncio.gather(
+            self.get_current_price(stock_code),
+            self.get_orderbook(stock_code),
+            self.get_minute_data(stock_code, period),
+            return_exceptions=True
+        )
+        bundle = {}
+        for name, result in zip(("price", "orderbook", "minute"), results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to fetch {name} for {stock_code}: {result}")
+                result = {"rt_cd": "1", "msg1": f"API Error: {result}"}
+            bundle[name] = result
+        return bundle
+
     async def get_volume_ranking(self, market: str = "J", sort: str = "1", count: int = 30) -> Dict:
+        """거래량 순위 조회 (동시 요청 병합 적용)"""
+        return await self._single_flight(f"volume_rank:{market}", self._fetch_volume_ranking, market)
+
+    async def _fetch_volume_ranking(self, market: str) -> Dict:
         """거래량 순위 조회 (스로틀링 적용)"""
         try:
             # API 호출 제한 적용
-            from ..utils.api_throttler import throttler
-            await throttler.throttle()
+            await self._throttler.throttle()
             
-            url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/volume-rank"
+            url = self._urls['volume_rank']
             headers = self._get_headers("FHPST01710000")
-            params = {
-                "fid_cond_mrkt_div_code": market,  # J: 코스피+코스닥, 0: 코스피, 1: 코스닥
-                "fid_cond_scr_div_code": "20171",
-                "fid_input_iscd": "0000",
-                "fid_div_cls_code": "0",
-                "fid_blng_cls_code": "0",
-                "fid_trgt_cls_code": "111111111",
-                "fid_trgt_exls_cls_code": "000000",
-                "fid_input_price_1": "",
-                "fid_input_price_2": "",
-                "fid_vol_cnt": "",
-                "fid_input_date_1": ""
-            }
+            # fid_cond_mrkt_div_code - J: 코스피+코스닥, 0: 코스피, 1: 코스닥
+            params = {**_VOLUME_RANK_PARAMS, "fid_cond_mrkt_div_code": market}
             
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.debug(f"Volume ranking request: URL={url}")
+            logger.debug("Volume ranking request: URL=%s", url)
             result = await self._request("GET", url, headers, params)
             
             if result.get('rt_cd') == '1':
@@ -258,39 +939,45 @@ class KISAPIClient:
                 
             return result
         except Exception as e:
-            import logging
-            import traceback
-            logger = logging.getLogger(__name__)
-            logger.error(f"Volume ranking API error: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Volume ranking API error: %s", e)
             return {"rt_cd": "1", "msg1": f"API Error: {e}"}
     
     async def get_daily_price(self, stock_code: str, start_date: str, end_date: str) -> Dict:
+        """일봉 데이터 조회 (과거 구간은 디스크 캐시, 당일 포함 구간은 단기 캐시 적용)"""
+        key = f"daily:{stock_code}:{start_date}:{end_date}"
+        if end_date < datetime.now().strftime("%Y%m%d"):
+            # 종료일이 지난 구간은 더 이상 바뀌지 않으므로 실행 간에도 재사용
+            return await self._disk_cached(key, _DAILY_PRICE_DISK_TTL, self._fetch_daily_price,
+                                           stock_code, start_date, end_date)
+        return await self._cached_single_flight(key, self._fetch_daily_price, stock_code, start_date, end_date,
+                                                ttl=_DAILY_PRICE_TODAY_TTL)
+
+    async def _fetch_daily_price(self, stock_code: str, start_date: str, end_date: str) -> Dict:
         """일봉 데이터 조회 (스로틀링 적용)"""
         # API 호출 제한 적용
-        from ..utils.api_throttler import throttler
-        await throttler.throttle()
+        await self._throttler.throttle()
         
-        url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice"
+        url = self._urls['daily_chart']
         headers = self._get_headers("FHKST03010100")
         params = {
-            "fid_cond_mrkt_div_code": "J",
+            **_DAILY_PRICE_PARAMS,
             "fid_input_iscd": stock_code,
             "fid_input_date_1": start_date,
-            "fid_input_date_2": end_date,
-            "fid_period_div_code": "D",  # 일봉
-            "fid_org_adj_prc": "1"       # 수정주가
+            "fid_input_date_2": end_date
         }
         
         return await self._request("GET", url, headers, params)
     
     async def get_index(self, index_code: str) -> Dict:
+        """지수 조회 (스로틀링 + 단기 캐시 + 동시 요청 병합 적용)"""
+        return await self._cached_single_flight(f"index:{index_code}", self._fetch_index, index_code)
+
+    async def _fetch_index(self, index_code: str) -> Dict:
         """지수 조회 (스로틀링 적용)"""
         # API 호출 제한 적용
-        from ..utils.api_throttler import throttler
-        await throttler.throttle()
+        await self._throttler.throttle()
         
-        url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/inquire-index-price"
+        url = self._urls['index_price']
         headers = self._get_headers("FHKUP03500100")  # 지수시세 조회 API 코드로 변경
         params = {
             "fid_cond_mrkt_div_code": "U",
@@ -300,14 +987,20 @@ class KISAPIClient:
         return await self._request("GET", url, headers, params)
     
     async def get_market_cap_ranking(self, market: str = "J", count: int = 30) -> Dict:
+        """시가총액 순위 조회 (단기 캐시 + 동시 요청 병합 적용)"""
+        return await self._cached_single_flight(f"market_cap:{market}", self._fetch_market_cap_ranking, market,
+                                                ttl=_RANKING_CACHE_TTL)
+
+    async def _fetch_market_cap_ranking(self, market: str) -> Dict:
         """시가총액 순위 조회"""
-        url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice"
+        url = self._urls['daily_chart']
         headers = self._get_headers("FHKST03010100")
+        today = datetime.now().strftime("%Y%m%d")
         params = {
             "fid_cond_mrkt_div_code": market,
             "fid_input_iscd": "0001",  # 시가총액 상위
-            "fid_input_date_1": datetime.now().strftime("%Y%m%d"),
-            "fid_input_date_2": datetime.now().strftime("%Y%m%d"),
+            "fid_input_date_1": today,
+            "fid_input_date_2": today,
             "fid_period_div_code": "D"
         }
         
@@ -315,17 +1008,12 @@ class KISAPIClient:
     
     async def get_fluctuation_ranking(self, market: str = "J", sort_type: str = "1") -> Dict:
         """등락률 순위 조회"""
-        url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/inquire-daily-price"
+        url = self._urls['daily_price']
         headers = self._get_headers("FHPST01730000")
         params = {
+            **_FLUCTUATION_RANK_PARAMS,
             "fid_cond_mrkt_div_code": market,
-            "fid_cond_scr_div_code": "20173",
-            "fid_input_iscd": "0001",
-            "fid_rank_sort_cls_code": sort_type,  # 1: 상승률, 2: 하락률
-            "fid_input_cnt_1": "30",
-            "fid_prc_cls_code": "1",
-            "fid_input_price_1": "1000",  # 최소가격 1000원
-            "fid_input_price_2": "100000"  # 최대가격 100000원
+            "fid_rank_sort_cls_code": sort_type  # 1: 상승률, 2: 하락률
         }
         
         return await self._request("GET", url, headers, params)
@@ -342,7 +1030,8 @@ class KISAPIClient:
                 logger.error("Failed to get volume ranking for active stocks")
                 return []
             
-            active_stocks = []
+            # 종목 단위 파싱/제외 조건은 파이썬에서, 수치 필터링과 점수 계산은 배열 연산으로 처리
+            codes, names, prices, volumes, rates = [], [], [], [], []
             for item in volume_data.get('output', [])[:30]:  # 상위 30개 검토
                 try:
                     stock_code = item.get('mksc_shrn_iscd', '')
@@ -350,51 +1039,61 @@ class KISAPIClient:
                     current_price = float(item.get('stck_prpr', 0))
                     volume = int(item.get('acml_vol', 0))
                     change_rate = float(item.get('prdy_ctrt', 0))
-                    
-                    # ETF, ETN 제외
-                    if any(exclude in stock_name for exclude in ['ETF', 'ETN', 'KODEX', 'TIGER', 'KBSTAR']):
-                        continue
-                    
-                    # 관리종목 제외 (종목코드로 판단)
-                    if not stock_code or len(stock_code) != 6 or stock_code.startswith(('9', 'Q')):
-                        continue
-                    
-                    # 너무 극단적인 등락률 제외
-                    if abs(change_rate) > 30.0:
-                        continue
-                    
-                    # 필터링 조건
-                    if (min_price <= current_price <= max_price and 
-                        volume > 1000000 and  # 거래량 100만주 이상
-                        abs(change_rate) > 1.0):  # 등락률 1% 이상
-                        
-                        # 점수 계산 (거래량 * 등락률 * 가격 보정)
-                        price_factor = 1.0
-                        if current_price < 10000:
-                            price_factor = 0.8  # 저가주 감점
-                        elif current_price > 50000:
-                            price_factor = 0.9  # 고가주 감점
-                        
-                        score = volume * abs(change_rate) * price_factor
-                        
-                        active_stocks.append({
-                            'stock_code': stock_code,
-                            'stock_name': stock_name,
-                            'current_price': current_price,
-                            'volume': volume,
-                            'change_rate': change_rate,
-                            'score': score
-                        })
-                        
                 except (ValueError, TypeError) as e:
-                    logger.debug(f"Error parsing stock data: {e}")
+                    logger.debug("Error parsing stock data: %s", e)
                     continue
+
+                # ETF, ETN 제외
+                if _ETF_NAME_RE.search(stock_name):
+                    continue
+
+                # 관리종목 제외 (종목코드로 판단)
+                if not stock_code or len(stock_code) != 6 or stock_code.startswith(('9', 'Q')):
+                    continue
+
+                codes.append(stock_code)
+                names.append(stock_name)
+                prices.append(current_price)
+                volumes.append(volume)
+                rates.append(change_rate)
+
+            if not codes:
+                logger.info("Found 0 active stocks after filtering")
+                return []
+
+            price_arr = np.array(prices, dtype=np.float64)
+            volume_arr = np.array(volumes, dtype=np.int64)
+            rate_arr = np.array(rates, dtype=np.float64)
+            abs_rate = np.abs(rate_arr)
+
+            # 필터링 조건: 극단적 등락률(30% 초과) 제외, 가격 범위, 거래량 100만주 이상, 등락률 1% 이상
+            mask = ((abs_rate <= 30.0) &
+                    (price_arr >= min_price) & (price_arr <= max_price) &
+                    (volume_arr > 1000000) &
+                    (abs_rate > 1.0))
+
+            # 점수 계산 (거래량 * 등락률 * 가격 보정: 저가주 0.8, 고가주 0.9)
+            price_factor = np.where(price_arr < 10000, 0.8, np.where(price_arr > 50000, 0.9, 1.0))
+            scores = volume_arr * abs_rate * price_factor
+
+            # 점수 순으로 정렬 (동점은 원래 순서 유지)
+            selected = np.flatnonzero(mask)
+            ranked = selected[np.argsort(-scores[selected], kind='stable')]
+
+            active_stocks = [
+                {
+                    'stock_code': codes[i],
+                    'stock_name': names[i],
+                    'current_price': prices[i],
+                    'volume': volumes[i],
+                    'change_rate': rates[i],
+                    'score': float(scores[i])
+                }
+                for i in ranked[:10]
+            ]
+            logger.info("Found %d active stocks after filtering", len(selected))
             
-            # 점수 순으로 정렬
-            active_stocks.sort(key=lambda x: x['score'], reverse=True)
-            logger.info(f"Found {len(active_stocks)} active stocks after filtering")
-            
-            return active_stocks[:10]  # 상위 10개만 반환
+            return active_stocks  # 상위 10개만 반환
             
         except Exception as e:
             logger.error(f"Error getting active stocks: {e}")
@@ -402,7 +1101,7 @@ class KISAPIClient:
     
     async def get_websocket_approval_key(self):
         """WebSocket 접속키 발급"""
-        url = f"{self.base_url}/oauth2/Approval"
+        url = self._urls['approval']
         data = {
             "grant_type": "client_credentials",
             "appkey": self.app_key,
@@ -411,15 +1110,15 @@ class KISAPIClient:
         
         async with self.session.post(url, json=data) as response:
             if response.status == 200:
-                result = await response.json()
+                result = await response.json(loads=_json_loads)
                 approval_key = result.get("approval_key")
                 logger.info("WebSocket approval key obtained successfully")
-                logger.debug(f"Approval key: {approval_key}")
+                logger.debug("Approval key: %s", approval_key)
                 return approval_key
             else:
                 logger.error(f"Failed to get WebSocket approval key: {response.status}")
                 text = await response.text()
-                logger.debug(f"Response: {text}")
+                logger.debug("Response: %s", text)
                 return None
     
     async def connect_websocket(self, approval_key: str = None):
@@ -431,28 +1130,35 @@ class KISAPIClient:
                     raise Exception("Failed to get WebSocket approval key")
 
             self.approval_key = approval_key
-            logger.debug(f"Using approval key: {approval_key}")
-            logger.debug(f"Attempting WebSocket connection to: {self.ws_url}")
+            self._heartbeat_payload = self._build_heartbeat_payload(approval_key)
+            self._subscribe_template = self._build_subscribe_template(approval_key)
+            logger.debug("Using approval key: %s", approval_key)
+            logger.debug("Attempting WebSocket connection to: %s", self.ws_url)
 
             # ping/pong 설정으로 연결 유지 (extra_headers 제거)
             self.websocket = await websockets.connect(
                 self.ws_url,
                 ping_interval=20,  # 20초마다 ping
                 ping_timeout=10,   # ping 응답 대기시간 10초
-                close_timeout=10   # 연결 종료 대기시간 10초
+                close_timeout=10,  # 연결 종료 대기시간 10초
+                compression=None,  # 작은 틱 메시지에는 permessage-deflate 압축 해제 비용만 발생
+                max_size=_WS_MAX_MESSAGE_SIZE,
+                max_queue=_WS_MAX_QUEUE,
+                write_limit=_WS_WRITE_LIMIT
             )
 
+            self._ws_connected = True
             logger.info("WebSocket connected successfully")
-            logger.debug(f"WebSocket state: {self.websocket.state}")
+            logger.debug("WebSocket state: %s", self.websocket.state)
 
             # 연결 성공 시 재연결 카운터 리셋
             self.ws_reconnect_attempts = 0
             self.is_reconnecting = False
-            self.last_heartbeat = datetime.now()
+            self.last_heartbeat_ts = asyncio.get_running_loop().time()
 
         except Exception as e:
             logger.error(f"WebSocket connection failed: {e}")
-            logger.debug(f"WebSocket URL: {self.ws_url}")
+            logger.debug("WebSocket URL: %s", self.ws_url)
             raise
 
     async def _reconnect_websocket(self):
@@ -471,10 +1177,11 @@ class KISAPIClient:
                 await asyncio.sleep(wait_time)
 
                 # 기존 연결 정리
+                self._ws_connected = False
                 if self.websocket:
                     try:
                         await self.websocket.close()
-                    except:
+                    except Exception:
                         pass
                     self.websocket = None
 
@@ -492,46 +1199,100 @@ class KISAPIClient:
         self.is_reconnecting = False
 
     def is_websocket_connected(self) -> bool:
-        """WebSocket 연결 상태 확인"""
-        try:
-            return (
-                self.websocket is not None and
-                self.websocket.state == websockets.protocol.State.OPEN
-            )
-        except AttributeError:
-            # 호환성을 위한 폴백
-            return self.websocket is not None
+        """WebSocket 연결 상태 확인 (연결/종료/오류 시 갱신되는 캐시 값 사용)"""
+        return self._ws_connected and self.websocket is not None
+
+    async def _probe_websocket(self) -> bool:
+        """실제 소켓 상태 확인 (OPEN 상태이고 ping에 응답해야 연결된 것으로 판단)
+
+        예외 없이 끊긴 half-open 연결은 캐시 값만으로 알 수 없으므로 유휴 점검에서 사용한다.
+        끊긴 것으로 판단되면 캐시 값도 갱신한다.
+        """
+        websocket = self.websocket
+        alive = False
+        if websocket is not None:
+            try:
+                # websockets 버전마다 State 위치가 달라 이름으로 비교
+                if getattr(websocket.state, 'name', None) == 'OPEN':
+                    pong_waiter = await websocket.ping()
+                    await asyncio.wait_for(pong_waiter, timeout=_WS_PROBE_TIMEOUT)
+                    alive = True
+            except Exception as e:
+                logger.warning(f"WebSocket ping check failed: {e!r}")
+        if not alive:
+            self._ws_connected = False
+        return alive
     
-    def decrypt_data(self, encrypted_data: str) -> str:
-        """WebSocket 데이터 복호화"""
+    def _set_encryption_keys(self, key: Optional[str], iv: Optional[str]):
+        """암호화 키/IV 저장 및 AES용 바이트 미리 계산"""
+        self.encryption_key = key
+        self.encryption_iv = iv
+        self._aes_key_bytes = key.encode('utf-8')[:32].ljust(32, b'\0') if key else None
+        self._aes_iv_bytes = iv.encode('utf-8')[:16].ljust(16, b'\0') if iv else None
+        # cryptography 사용 시 Cipher 객체를 유지하고 메시지마다 decryptor만 새로 생성
+        self._aes_cipher = None
+        if CRYPTOGRAPHY_AVAILABLE and self._aes_key_bytes and self._aes_iv_bytes:
+            self._aes_cipher = Cipher(algorithms.AES(self._aes_key_bytes), modes.CBC(self._aes_iv_bytes))
+        # 메시지마다 라이브러리/키 유무를 다시 확인하지 않도록 복호화 가능 여부를 미리 계산
+        self._can_decrypt = bool(CRYPTO_AVAILABLE and key and iv)
+
+    def _decrypt_one(self, encrypted_data: Union[str, bytes]) -> str:
+        """Base64 디코딩 후 AES CBC 복호화 (실패 시 예외 발생)"""
+        # Base64 디코딩 (bytes 입력은 ASCII 인코딩 단계 없이 바로 디코딩)
+        encrypted_bytes = binascii.a2b_base64(encrypted_data)
+
+        # AES CBC 복호화 (KIS는 메시지마다 같은 IV로 따로 암호화하므로 메시지마다 컨텍스트 새로 생성)
+        if self._aes_cipher is not None:
+            decryptor = self._aes_cipher.decryptor()
+            decrypted = decryptor.update(encrypted_bytes) + decryptor.finalize()
+            return _pkcs7_unpad(decrypted).decode('utf-8')
+        cipher = AES.new(self._aes_key_bytes, AES.MODE_CBC, self._aes_iv_bytes)
+        return unpad(cipher.decrypt(encrypted_bytes), AES.block_size).decode('utf-8')
+
+    def _warn_cannot_decrypt(self):
+        """복호화할 수 없는 이유 로깅"""
         if not CRYPTO_AVAILABLE:
-            logger.warning("pycryptodome not available, cannot decrypt data")
-            return encrypted_data
-            
-        if not self.encryption_key or not self.encryption_iv:
+            logger.warning("pycryptodome/cryptography not available, cannot decrypt data")
+        else:
             logger.warning("Encryption key/iv not available, cannot decrypt data")
+
+    def decrypt_data(self, encrypted_data: Union[str, bytes]) -> str:
+        """WebSocket 데이터 복호화 (수신 프레임이 bytes면 str 변환 없이 그대로 Base64 디코딩)"""
+        if not self._can_decrypt:
+            self._warn_cannot_decrypt()
             return encrypted_data
             
         try:
-            # Base64 디코딩
-            encrypted_bytes = base64.b64decode(encrypted_data)
-            
-            # AES CBC 복호화
-            cipher = AES.new(
-                self.encryption_key.encode('utf-8')[:32].ljust(32, b'\0'), 
-                AES.MODE_CBC, 
-                self.encryption_iv.encode('utf-8')[:16].ljust(16, b'\0')
-            )
-            
-            decrypted = cipher.decrypt(encrypted_bytes)
-            decrypted_data = unpad(decrypted, AES.block_size).decode('utf-8')
-            
-            logger.debug(f"Successfully decrypted data: {decrypted_data[:100]}...")
+            decrypted_data = self._decrypt_one(encrypted_data)
+            logger.debug("Successfully decrypted data: %.100s...", decrypted_data)
             return decrypted_data
             
         except Exception as e:
             logger.error(f"Failed to decrypt data: {e}")
             return encrypted_data
+
+    def decrypt_many(self, encrypted_list: List[Union[str, bytes]]) -> List[str]:
+        """여러 암호문을 한 번에 복호화 (키 확인/로깅을 묶음 단위로 한 번만 수행)
+
+        CBC 체인을 메시지 사이에 이어 붙일 수는 없으므로 암호문마다 decryptor를 새로 만들지만,
+        Cipher 객체와 키/IV 바이트는 공유한다. 실패한 항목은 원래 값을 그대로 돌려준다.
+        """
+        if not self._can_decrypt:
+            self._warn_cannot_decrypt()
+            return list(encrypted_list)
+
+        decrypt_one = self._decrypt_one
+        results = []
+        failed = 0
+        for encrypted_data in encrypted_list:
+            try:
+                results.append(decrypt_one(encrypted_data))
+            except Exception:
+                failed += 1
+                results.append(encrypted_data)
+        if failed:
+            logger.error(f"Failed to decrypt {failed}/{len(encrypted_list)} messages")
+        return results
     
     async def subscribe_realtime_price(self, stock_codes: List[str]):
         """실시간 현재가 구독 (연결 상태 확인 포함)"""
@@ -542,267 +1303,318 @@ class KISAPIClient:
         if not self.is_websocket_connected():
             raise Exception("WebSocket connection failed after reconnection attempts")
 
-        logger.debug(f"Subscribing to {len(stock_codes)} stock codes: {stock_codes}")
+        logger.debug("Subscribing to %d stock codes: %s", len(stock_codes), stock_codes)
 
-        for stock_code in stock_codes:
-            try:
-                subscribe_data = {
-                    "header": {
-                        "approval_key": getattr(self, 'approval_key', self.app_key),
-                        "custtype": "P",
-                        "tr_type": "1",
-                        "content-type": "utf-8"
-                    },
-                    "body": {
-                        "input": {
-                            "tr_id": "H0STCNT0",
-                            "tr_key": stock_code
-                        }
-                    }
-                }
+        approval_key = getattr(self, 'approval_key', self.app_key)
+        if self._subscribe_template is None or self._subscribe_template[0] != approval_key:
+            self._subscribe_template = self._build_subscribe_template(approval_key)
+        _, prefix, suffix = self._subscribe_template
 
-                logger.debug(f"Sending subscription data for {stock_code}: {json.dumps(subscribe_data, indent=2)}")
-                await self.websocket.send(json.dumps(subscribe_data))
-                logger.info(f"Subscribed to real-time price for {stock_code}")
+        # 종목별 구독 메시지를 먼저 모두 직렬화 (미리 직렬화한 템플릿에 종목코드만 삽입)
+        payloads = [prefix + _json_dumps(stock_code) + suffix for stock_code in stock_codes]
 
-                # 구독 간 짧은 대기
+        # 배치 단위로 연속 전송, 배치 간에만 짧게 대기
+        # (KIS는 프레임당 요청 1건만 받으므로 프레임을 합치지 않고, 메시지마다 태스크를 만들지 않도록
+        #  한 코루틴에서 차례로 send한다. send는 송신 버퍼가 찰 때만 대기하므로 사실상 연속 기록된다)
+        send = self.websocket.send
+        for start in range(0, len(payloads), _WS_SUBSCRIBE_BATCH_SIZE):
+            if start:
                 await asyncio.sleep(0.1)
 
-            except Exception as e:
-                logger.error(f"Failed to subscribe to {stock_code}: {e}")
-                # 연결 문제가 의심되면 재연결 시도
-                if "connection" in str(e).lower() or "closed" in str(e).lower():
-                    logger.warning("Connection issue detected, attempting reconnection...")
-                    await self._reconnect_websocket()
-                raise
+            for stock_code, payload in zip(stock_codes[start:start + _WS_SUBSCRIBE_BATCH_SIZE],
+                                           payloads[start:start + _WS_SUBSCRIBE_BATCH_SIZE]):
+                logger.debug("Sending subscription data for %s: %s", stock_code, payload)
+                try:
+                    await send(payload)
+                except Exception as e:
+                    logger.error(f"Failed to subscribe to {stock_code}: {e}")
+                    # 연결 문제가 의심되면 재연결 시도
+                    if "connection" in str(e).lower() or "closed" in str(e).lower():
+                        logger.warning("Connection issue detected, attempting reconnection...")
+                        self._ws_connected = False
+                        await self._reconnect_websocket()
+                    raise
+                logger.info("Subscribed to real-time price for %s", stock_code)
     
     def _parse_realtime_data(self, data_str: str) -> Dict:
         """실시간 파이프 구분 데이터 파싱"""
         try:
-            parts = data_str.split('|')
-            if len(parts) < 4:
-                return None
-                
-            compress_flag = parts[0]
-            tr_id = parts[1]
-            seq = parts[2]
-            data_part = parts[3]
-            
-            # H0STCNT0 (주식 현재가) 데이터 파싱
-            if tr_id == "H0STCNT0":
-                fields = data_part.split('^')
-                if len(fields) >= 15:
-                    def safe_int(value, default=0):
-                        try:
-                            return int(value) if value and value != '' else default
-                        except ValueError:
-                            return default
-                    
-                    def safe_float(value, default=0.0):
-                        try:
-                            return float(value) if value and value != '' else default
-                        except ValueError:
-                            return default
-                    
-                    return {
-                        "tr_id": tr_id,
-                        "stock_code": fields[0],
-                        "time": fields[1],
-                        "current_price": safe_int(fields[2]),
-                        "change": safe_int(fields[4]),
-                        "change_rate": safe_float(fields[5]),
-                        "volume": safe_int(fields[12]),
-                        "trade_value": safe_int(fields[13]),
-                        "bid_price": safe_int(fields[7]),
-                        "ask_price": safe_int(fields[8]),
-                        "high_price": safe_int(fields[9]),
-                        "low_price": safe_int(fields[10]),
-                        "prev_close": safe_int(fields[11])
-                    }
-            
-            # 다른 TR_ID도 필요시 추가
-            return {
-                "tr_id": tr_id,
-                "raw_data": data_part,
-                "compress_flag": compress_flag,
-                "seq": seq
-            }
-            
+            return parse_realtime_data(data_str)
         except Exception as e:
             logger.error(f"Failed to parse realtime data: {e}")
             return None
 
     async def listen_websocket(self, callback):
-        """WebSocket 메시지 수신 (연결 모니터링 및 자동 재연결 포함)"""
+        """WebSocket 메시지 수신 (연결 모니터링 및 자동 재연결 포함)
+
+        수신 루프는 메시지를 큐에 넣기만 하고, 파싱과 콜백 호출은 별도 소비 태스크가
+        처리한다. 콜백이 느려도 recv()가 계속 소켓 버퍼를 비울 수 있다.
+        """
         if not self.is_websocket_connected():
             raise Exception("WebSocket not connected")
 
         logger.info("Starting WebSocket message listener with auto-reconnection")
         message_count = 0
-        last_message_time = datetime.now()
+        idle_ticks = 0  # 연속으로 수신 타임아웃이 발생한 횟수
 
-        while True:
-            try:
-                # 연결 상태 확인
-                if not self.is_websocket_connected():
-                    logger.warning("WebSocket connection lost, attempting reconnection...")
-                    await self._reconnect_websocket()
+        self._rx_queue = asyncio.Queue(maxsize=_WS_RX_QUEUE_SIZE)
+        consumer_task = asyncio.create_task(self._consume_messages(self._rx_queue, callback))
+
+        try:
+            while True:
+                try:
+                    # 연결 상태 확인
                     if not self.is_websocket_connected():
-                        logger.error("Failed to reconnect WebSocket")
-                        break
+                        logger.warning("WebSocket connection lost, attempting reconnection...")
+                        await self._reconnect_websocket()
+                        if not self.is_websocket_connected():
+                            logger.error("Failed to reconnect WebSocket")
+                            break
 
-                # Heartbeat 체크
-                await self._check_heartbeat()
+                    # Heartbeat 체크
+                    await self._check_heartbeat()
 
-                # 메시지 수신 (타임아웃 설정)
-                try:
-                    message = await asyncio.wait_for(self.websocket.recv(), timeout=30.0)
-                    message_count += 1
-                    last_message_time = datetime.now()
+                    # 메시지 수신 (타임아웃 설정)
+                    try:
+                        message = await asyncio.wait_for(self.websocket.recv(), timeout=_WS_RECV_TIMEOUT)
+                        message_count += 1
+                        idle_ticks = 0
+
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("Received WebSocket message #%d", message_count)
+                            logger.debug("Message type: %s, length: %d", type(message), len(message) if message else 0)
+                            if message:
+                                logger.debug("Raw message (first 200 chars): %s...", str(message)[:200])
+
+                        # 빈 메시지나 ping/pong 메시지 무시
+                        if not message or message in ['ping', 'pong']:
+                            logger.debug("Ignoring empty or ping/pong message #%d", message_count)
+                            continue
+
+                        try:
+                            self._rx_queue.put_nowait((message_count, message))
+                        except asyncio.QueueFull:
+                            # 소비가 밀리면 가장 오래된 메시지를 버리고 최신 메시지 유지
+                            self._rx_queue.get_nowait()
+                            self._rx_queue.put_nowait((message_count, message))
+                            logger.warning(f"WebSocket receive queue full, dropped oldest message (#{message_count})")
+
+                    except asyncio.TimeoutError:
+                        # 30초 동안 메시지가 없으면 연결 상태 의심
+                        idle_ticks += 1
+                        idle_seconds = idle_ticks * _WS_RECV_TIMEOUT
+                        if idle_seconds >= _WS_IDLE_CHECK_SECONDS:  # 1분 이상 메시지 없음
+                            idle_ticks = 0
+                            logger.warning(f"No messages received for {idle_seconds:.0f}s, checking connection...")
+                            if not await self._probe_websocket():
+                                logger.warning("Connection lost, attempting reconnection...")
+                                await self._reconnect_websocket()
+                        continue
 
-                    logger.debug(f"Received WebSocket message #{message_count}")
-                    logger.debug(f"Message type: {type(message)}, length: {len(message) if message else 0}")
+                except websockets.exceptions.ConnectionClosed as e:
+                    logger.warning(f"WebSocket connection closed: {e}")
+                    self._ws_connected = False
+                    await self._reconnect_websocket()
+                    continue
 
-                    if message:
-                        logger.debug(f"Raw message (first 200 chars): {str(message)[:200]}...")
+                except Exception as e:
+                    logger.error(f"WebSocket listener error: {e}")
+                    logger.debug("Total messages processed: %d", message_count)
 
-                    # 빈 메시지나 ping/pong 메시지 무시
-                    if not message or message in ['ping', 'pong']:
-                        logger.debug(f"Ignoring empty or ping/pong message #{message_count}")
+                    # 심각한 오류인 경우 재연결 시도
+                    if "connection" in str(e).lower() or "closed" in str(e).lower():
+                        self._ws_connected = False
+                        await self._reconnect_websocket()
+                        continue
+                    else:
+                        # 다른 오류는 짧은 대기 후 계속
+                        await asyncio.sleep(1)
                         continue
+        finally:
+            consumer_task.cancel()
+            # 취소된 소비 태스크가 실제로 끝날 때까지 대기 (예외는 회수만 하고 무시)
+            await asyncio.gather(consumer_task, return_exceptions=True)
+            self._rx_queue = None
 
-                    # 여러 JSON 객체가 연결된 경우 처리
-                    message_str = str(message).strip()
-                    if message_str.count('{') > 1:
-                        logger.debug(f"Message contains multiple JSON objects, processing first one")
-                        # 첫 번째 완전한 JSON 객체만 추출
-                        brace_count = 0
-                        first_json_end = 0
-                        for i, char in enumerate(message_str):
-                            if char == '{':
-                                brace_count += 1
-                            elif char == '}':
-                                brace_count -= 1
-                                if brace_count == 0:
-                                    first_json_end = i + 1
-                                    break
-                        if first_json_end > 0:
-                            message_str = message_str[:first_json_end]
-
-                    # JSON 메시지 처리 시도
-                    try:
-                        data = json.loads(message_str)
-                        logger.debug(f"Parsed JSON data keys: {list(data.keys()) if isinstance(data, dict) else 'Not a dict'}")
-
-                        # 구독 성공 메시지에서 암호화 키 저장
-                        if isinstance(data, dict) and data.get('body', {}).get('msg1') == 'SUBSCRIBE SUCCESS':
-                            output = data.get('body', {}).get('output', {})
-                            if 'key' in output and 'iv' in output:
-                                self.encryption_key = output['key']
-                                self.encryption_iv = output['iv']
-                                logger.info("Encryption key/iv obtained from subscribe success message")
-                                logger.debug(f"Key: {self.encryption_key}, IV: {self.encryption_iv}")
-                            # 구독 성공 메시지는 콜백 호출하지 않음
-                            continue
+        logger.info(f"WebSocket listener stopped. Total messages processed: {message_count}")
 
-                        # 암호화된 실시간 데이터 처리
-                        elif isinstance(data, dict) and data.get('header', {}).get('encrypt') == 'Y':
-                            logger.debug("Received encrypted real-time data")
-                            if 'body' in data and isinstance(data['body'], str):
-                                decrypted_body = self.decrypt_data(data['body'])
-                                try:
-                                    data['body'] = json.loads(decrypted_body)
-                                    logger.debug("Successfully decrypted and parsed real-time data")
-                                except json.JSONDecodeError:
-                                    logger.warning("Failed to parse decrypted data as JSON")
-
-                        # 유의미한 데이터만 콜백 처리
-                        if isinstance(data, dict) and ('header' in data or 'body' in data):
-                            logger.info(f"Processing JSON WebSocket message #{message_count}")
-                            await callback(data)
-
-                    except json.JSONDecodeError:
-                        # JSON이 아닌 경우 파이프 구분 데이터 파싱 시도
-                        if '|' in message_str:
-                            logger.debug(f"Attempting to parse pipe-separated data #{message_count}")
-                            parsed_data = self._parse_realtime_data(message_str)
-                            if parsed_data:
-                                logger.info(f"Processing realtime data for {parsed_data.get('stock_code', 'unknown')}: {parsed_data.get('current_price', 0)}")
-                                await callback(parsed_data)
-                            else:
-                                logger.debug(f"Failed to parse realtime data #{message_count}")
-                        else:
-                            logger.debug(f"Skipping non-JSON/non-pipe message #{message_count}: {message_str[:50]}...")
-
-                    except Exception as e:
-                        logger.error(f"Error processing WebSocket message #{message_count}: {e}")
-
-                except asyncio.TimeoutError:
-                    # 30초 동안 메시지가 없으면 연결 상태 의심
-                    time_since_last = (datetime.now() - last_message_time).total_seconds()
-                    if time_since_last > 60:  # 1분 이상 메시지 없음
-                        logger.warning(f"No messages received for {time_since_last:.0f}s, checking connection...")
-                        if not self.is_websocket_connected():
-                            logger.warning("Connection lost, attempting reconnection...")
-                            await self._reconnect_websocket()
-                    continue
+    async def _consume_messages(self, queue: asyncio.Queue, callback):
+        """수신 큐에 쌓인 메시지를 최대 _WS_RX_BATCH_SIZE개씩 꺼내 순서대로 처리"""
+        if not asyncio.iscoroutinefunction(callback):
+            # 동기 콜백은 이벤트 루프에서 바로 호출 (트레이더 상태를 다른 스레드에서 건드리지 않도록)
+            sync_callback = callback
 
-            except websockets.exceptions.ConnectionClosed as e:
-                logger.warning(f"WebSocket connection closed: {e}")
-                await self._reconnect_websocket()
-                continue
+            async def callback(data):
+                sync_callback(data)
 
-            except Exception as e:
-                logger.error(f"WebSocket listener error: {e}")
-                logger.debug(f"Total messages processed: {message_count}")
+        while True:
+            batch = [await queue.get()]
+            while not queue.empty() and len(batch) < _WS_RX_BATCH_SIZE:
+                batch.append(queue.get_nowait())
 
-                # 심각한 오류인 경우 재연결 시도
-                if "connection" in str(e).lower() or "closed" in str(e).lower():
-                    await self._reconnect_websocket()
-                    continue
+            for message_no, message in batch:
+                await self._process_message(message_no, message, callback)
+
+    async def _process_message(self, message_count: int, message, callback):
+        """수신 메시지 1건 파싱 후 콜백 호출"""
+        if isinstance(message, bytes):
+            message = message.decode('utf-8')
+        message_str = message.strip()
+
+        try:
+            # 첫 글자로 형식 판별: '{' 는 JSON 제어 메시지, 그 외는 파이프 구분 실시간 데이터
+            # (실시간 틱마다 JSON 파싱 실패 예외가 발생하지 않도록 먼저 분기)
+            if message_str[:1] != _JSON_PREFIX:
+                if _PIPE_DELIMITER in message_str:
+                    logger.debug("Attempting to parse pipe-separated data #%d", message_count)
+                    parsed_data = self._parse_realtime_data(message_str)
+                    if parsed_data:
+                        logger.info("Processing realtime data for %s: %s",
+                                    parsed_data.get('stock_code', 'unknown'), parsed_data.get('current_price', 0))
+                        await callback(parsed_data)
+                    else:
+                        logger.debug("Failed to parse realtime data #%d", message_count)
                 else:
-                    # 다른 오류는 짧은 대기 후 계속
-                    await asyncio.sleep(1)
-                    continue
+                    logger.debug("Skipping non-JSON/non-pipe message #%d: %.50s...", message_count, message_str)
+                return
 
-        logger.info(f"WebSocket listener stopped. Total messages processed: {message_count}")
+            try:
+                objects = (_json_loads(message_str),)
+            except _JSONDecodeError:
+                # 여러 JSON 객체가 연결된 프레임은 객체마다 나눠서 모두 처리
+                objects = _split_json_objects(message_str)
+                logger.debug("Message #%d contains %d JSON objects", message_count, len(objects))
+
+            if len(objects) > 1:
+                self._decrypt_bodies(objects)
+            for data in objects:
+                await self._process_json_message(message_count, data, callback)
+
+        except json.JSONDecodeError:
+            logger.debug("Skipping malformed JSON message #%d: %.50s...", message_count, message_str)
+
+        except Exception as e:
+            logger.error(f"Error processing WebSocket message #{message_count}: {e}")
+
+    def _decrypt_bodies(self, objects: list):
+        """한 프레임에 함께 온 암호화 메시지 본문을 decrypt_many로 한 번에 복호화해 제자리 교체"""
+        if not self._can_decrypt:
+            return
+        encrypted = [
+            data for data in objects
+            if isinstance(data, dict) and isinstance(data.get('body'), str)
+            and isinstance(data.get('header'), dict) and data['header'].get('encrypt') == 'Y'
+        ]
+        if not encrypted:
+            return
+        for data, decrypted_body in zip(encrypted, self.decrypt_many([data['body'] for data in encrypted])):
+            try:
+                data['body'] = _json_loads(decrypted_body)
+            except _JSONDecodeError:
+                logger.warning("Failed to parse decrypted data as JSON")
+
+    async def _process_json_message(self, message_count: int, data, callback):
+        """JSON 제어/실시간 메시지 1건 처리 (구독 성공 시 암호화 키 저장, 암호화 데이터 복호화 후 콜백)"""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Parsed JSON data keys: %s", list(data.keys()) if isinstance(data, dict) else 'Not a dict')
+
+        if not isinstance(data, dict):
+            return
+        # header/body는 한 번만 꺼내 재사용 (기본값 dict 생성 없이 조회)
+        header = data.get('header')
+        body = data.get('body')
+
+        # 구독 성공 메시지에서 암호화 키 저장
+        if isinstance(body, dict) and body.get('msg1') == 'SUBSCRIBE SUCCESS':
+            output = body.get('output') or {}
+            if 'key' in output and 'iv' in output:
+                self._set_encryption_keys(output['key'], output['iv'])
+                logger.info("Encryption key/iv obtained from subscribe success message")
+                logger.debug("Key: %s, IV: %s", self.encryption_key, self.encryption_iv)
+            # 구독 성공 메시지는 콜백 호출하지 않음
+            return
+
+        # 암호화된 실시간 데이터 처리
+        if header is not None and header.get('encrypt') == 'Y':
+            logger.debug("Received encrypted real-time data")
+            if not self._can_decrypt:
+                logger.warning("Encryption key/iv not available, passing encrypted data through")
+            elif isinstance(body, str):
+                decrypted_body = self.decrypt_data(body)
+                try:
+                    data['body'] = _json_loads(decrypted_body)
+                    logger.debug("Successfully decrypted and parsed real-time data")
+                except _JSONDecodeError:
+                    logger.warning("Failed to parse decrypted data as JSON")
+
+        # 유의미한 데이터만 콜백 처리
+        if header is not None or body is not None:
+            logger.info("Processing JSON WebSocket message #%d", message_count)
+            await callback(data)
+
+    def _build_subscribe_template(self, approval_key: str) -> Tuple[str, str, str]:
+        """실시간 체결가 구독 메시지를 종목코드 앞/뒤 문자열로 나눠 직렬화 (approval key가 바뀔 때만 다시 생성)"""
+        subscribe_data = {
+            "header": {
+                "approval_key": approval_key,
+                "custtype": "P",
+                "tr_type": "1",
+                "content-type": "utf-8"
+            },
+            "body": {
+                "input": {
+                    "tr_id": "H0STCNT0",
+                    "tr_key": _SUBSCRIBE_TR_KEY_PLACEHOLDER
+                }
+            }
+        }
+        prefix, suffix = _json_dumps(subscribe_data).split(_json_dumps(_SUBSCRIBE_TR_KEY_PLACEHOLDER), 1)
+        return approval_key, prefix, suffix
+
+    def _build_heartbeat_payload(self, approval_key: str) -> str:
+        """heartbeat 메시지 직렬화 (approval key가 바뀔 때만 다시 생성)"""
+        heartbeat_data = {
+            "header": {
+                "approval_key": approval_key,
+                "custtype": "P",
+                "tr_type": "1",
+                "content-type": "utf-8"
+            },
+            "body": {
+                "input": {
+                    "tr_id": "PINGPONG",
+                    "tr_key": "heartbeat"
+                }
+            }
+        }
+        return _json_dumps(heartbeat_data)
 
     async def _check_heartbeat(self):
         """Heartbeat 상태 확인 및 전송"""
-        if not self.last_heartbeat:
-            self.last_heartbeat = datetime.now()
+        now = asyncio.get_running_loop().time()
+        if not self.last_heartbeat_ts:
+            self.last_heartbeat_ts = now
             return
 
-        time_since_heartbeat = (datetime.now() - self.last_heartbeat).total_seconds()
+        time_since_heartbeat = now - self.last_heartbeat_ts
 
         if time_since_heartbeat > self.heartbeat_interval:
             try:
                 if self.is_websocket_connected():
-                    # 간단한 heartbeat 메시지 전송 (ping 형태)
-                    heartbeat_data = {
-                        "header": {
-                            "approval_key": getattr(self, 'approval_key', self.app_key),
-                            "custtype": "P",
-                            "tr_type": "1",
-                            "content-type": "utf-8"
-                        },
-                        "body": {
-                            "input": {
-                                "tr_id": "PINGPONG",
-                                "tr_key": "heartbeat"
-                            }
-                        }
-                    }
-
-                    await self.websocket.send(json.dumps(heartbeat_data))
-                    self.last_heartbeat = datetime.now()
+                    # 간단한 heartbeat 메시지 전송 (ping 형태, 미리 직렬화된 payload 재사용)
+                    if self._heartbeat_payload is None:
+                        self._heartbeat_payload = self._build_heartbeat_payload(
+                            getattr(self, 'approval_key', self.app_key)
+                        )
+                    await self.websocket.send(self._heartbeat_payload)
+                    self.last_heartbeat_ts = asyncio.get_running_loop().time()
                     logger.debug("Heartbeat sent to maintain WebSocket connection")
 
             except Exception as e:
                 logger.warning(f"Failed to send heartbeat: {e}")
-                # heartbeat 실패 시 연결 상태 의심
-                if not self.is_websocket_connected():
-                    logger.warning("Heartbeat failed - connection appears to be lost")
+                # heartbeat 전송 실패는 연결이 끊긴 것으로 보고 다음 루프에서 재연결
+                self._ws_connected = False
+                logger.warning("Heartbeat failed - connection appears to be lost")
 
     async def close_websocket(self):
         """WebSocket 연결 정리"""
@@ -815,30 +1627,38 @@ class KISAPIClient:
                 logger.warning(f"Error closing WebSocket: {e}")
             finally:
                 self.websocket = None
-                self.encryption_key = None
-                self.encryption_iv = None
-                self.last_heartbeat = None
+                self._ws_connected = False
+                self._set_encryption_keys(None, None)
+                self.last_heartbeat_ts = 0.0
+                self._heartbeat_payload = None
                 self.ws_reconnect_attempts = 0
                 self.is_reconnecting = False
 
+    def _last_heartbeat_isoformat(self) -> Optional[str]:
+        """monotonic heartbeat 시각을 상태 보고용 벽시계 ISO 문자열로 변환"""
+        if not self.last_heartbeat_ts:
+            return None
+        try:
+            elapsed = asyncio.get_running_loop().time() - self.last_heartbeat_ts
+        except RuntimeError:
+            # 실행 중인 이벤트 루프가 없으면 변환 불가
+            return None
+        return (datetime.now() - timedelta(seconds=elapsed)).isoformat()
+
     def get_websocket_status(self) -> Dict:
         """WebSocket 연결 상태 정보 반환"""
         status = {
             "connected": self.is_websocket_connected(),
             "reconnect_attempts": self.ws_reconnect_attempts,
             "is_reconnecting": self.is_reconnecting,
-            "last_heartbeat": self.last_heartbeat.isoformat() if self.last_heartbeat else None,
+            "last_heartbeat": self._last_heartbeat_isoformat(),
             "has_encryption_keys": bool(self.encryption_key and self.encryption_iv)
         }
 
         if self.websocket:
             try:
                 status["websocket_state"] = str(self.websocket.state)
-                # closed 속성이 있으면 사용, 없으면 state로 판단
-                if hasattr(self.websocket, 'closed'):
-                    status["websocket_closed"] = self.websocket.closed
-                else:
-                    status["websocket_closed"] = self.websocket.state != websockets.protocol.State.OPEN
+                status["websocket_closed"] = not self._ws_connected
             except AttributeError:
                 status["websocket_state"] = "unknown"
                 status["websocket_closed"] = False
@@ -846,12 +1666,16 @@ class KISAPIClient:
         return status
 
     async def get_financial_data(self, stock_code: str) -> Dict:
+        """재무정보 조회 (디스크 캐시 적용)"""
+        return await self._disk_cached(f"financial:{stock_code}", _FINANCIAL_DATA_DISK_TTL,
+                                       self._fetch_financial_data, stock_code)
+
+    async def _fetch_financial_data(self, stock_code: str) -> Dict:
         """재무정보 조회"""
         # API 호출 제한 적용
-        from ..utils.api_throttler import throttler
-        await throttler.throttle()
+        await self._throttler.throttle()
         
-        url = f"{self.base_url}/uapi/domestic-stock/v1/finance/balance-sheet"
+        url = self._urls['balance_sheet']
         headers = self._get_headers("FHKST66430200")
         params = {
             "fid_cond_mrkt_div_code": "J",
@@ -863,11 +1687,20 @@ class KISAPIClient:
     
     async def get_stock_overview(self, stock_code: str) -> Dict:
         """종목 개요 및 재무지표 조회 (DEPRECATED - use get_financial_ratios instead)"""
+        return await self._cached_single_flight(f"overview:{stock_code}", self._load_stock_overview, stock_code,
+                                                ttl=_OVERVIEW_MEMORY_TTL)
+
+    async def _load_stock_overview(self, stock_code: str) -> Dict:
+        """디스크 캐시 확인 후 종목 개요 조회"""
+        return await self._disk_cached(f"overview:{stock_code}", _OVERVIEW_DISK_TTL,
+                                       self._fetch_stock_overview, stock_code)
+
+    async def _fetch_stock_overview(self, stock_code: str) -> Dict:
+        """종목 개요 조회 (스로틀링 적용)"""
         # API 호출 제한 적용
-        from ..utils.api_throttler import throttler
-        await throttler.throttle()
+        await self._throttler.throttle()
 
-        url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/inquire-daily-price"
+        url = self._urls['daily_price']
         headers = self._get_headers("FHKST01010100")
         params = {
             "fid_cond_mrkt_div_code": "J",
@@ -877,11 +1710,24 @@ class KISAPIClient:
 
         return await self._request("GET", url, headers, params)
 
+    async def get_overview_fields(self, stock_code: str) -> Optional[OverviewFields]:
+        """종목 개요 재무 필드 조회 (응답 정규화 결과를 종목 개요와 같은 TTL로 메모리에 유지)"""
+        key = f"overview_fields:{stock_code}"
+        fields = self._response_cache.get(key)
+        if fields is None:
+            fields = _parse_overview_fields(await self.get_stock_overview(stock_code))
+            if fields is not None:
+                self._response_cache.set(key, fields, _OVERVIEW_MEMORY_TTL)
+        return fields
+
     async def get_financial_ratios(self, stock_code: str) -> Dict:
+        """재무비율 조회 (PER, PBR, ROE, PSR 등) - 단기 캐시 + 동시 요청 병합 적용"""
+        return await self._cached_single_flight(f"ratios:{stock_code}", self._fetch_financial_ratios, stock_code)
+
+    async def _fetch_financial_ratios(self, stock_code: str) -> Dict:
         """재무비율 조회 (PER, PBR, ROE, PSR 등) - 다중 TR_ID 시도"""
         # API 호출 제한 적용
-        from ..utils.api_throttler import throttler
-        await throttler.throttle()
+        await self._throttler.throttle()
 
         # 재무비율 관련 TR_ID 목록 (우선순위 순)
         tr_ids_to_try = [
@@ -891,241 +1737,226 @@ class KISAPIClient:
             ("FHKST66430200", "/uapi/domestic-stock/v1/finance/financial-ratio"),  # 원래 시도하던 것
         ]
 
+        # 우선순위 순으로 하나씩 시도하고 첫 성공에서 중단 (보통 1회 호출로 끝나 호출 한도를 아낌)
         last_error = None
-
-        for tr_id, endpoint in tr_ids_to_try:
+        for attempt, (tr_id, endpoint) in enumerate(tr_ids_to_try):
+            if attempt:
+                # 다음 TR_ID 재시도도 호출 제한 적용
+                await self._throttler.throttle()
             try:
                 url = f"{self.base_url}{endpoint}"
                 headers = self._get_headers(tr_id)
-
-                if tr_id == "FHKST03010100":
-                    # 일봉 데이터 파라미터
-                    params = {
-                        "fid_cond_mrkt_div_code": "J",
-                        "fid_input_iscd": stock_code,
-                        "fid_input_date_1": datetime.now().strftime("%Y%m%d"),
-                        "fid_input_date_2": datetime.now().strftime("%Y%m%d"),
-                        "fid_period_div_code": "D",
-                        "fid_org_adj_prc": "1"
-                    }
-                elif tr_id == "FHKST01010100":
-                    # 현재가 시세 파라미터
-                    params = {
-                        "fid_cond_mrkt_div_code": "J",
-                        "fid_input_iscd": stock_code
-                    }
-                else:
-                    # 기본 재무 관련 파라미터
-                    params = {
-                        "fid_cond_mrkt_div_code": "J",
-                        "fid_input_iscd": stock_code,
-                        "fid_input_date_1": "",
-                    }
-
+                params = self._financial_ratio_params(tr_id, stock_code)
                 result = await self._request("GET", url, headers, params)
-
-                if result and result.get('rt_cd') == '0':
-                    logger.debug(f"Financial ratios API success with TR_ID: {tr_id}")
-                    return result
-                else:
-                    logger.debug(f"Financial ratios API failed with TR_ID {tr_id}: {result.get('msg1', 'Unknown error')}")
-                    last_error = result
-
             except Exception as e:
-                logger.debug(f"Exception with TR_ID {tr_id}: {e}")
+                logger.debug("Exception with TR_ID %s: %s", tr_id, e)
                 last_error = {"rt_cd": "1", "msg1": f"Exception: {e}"}
                 continue
 
+            if result and result.get('rt_cd') == '0':
+                logger.debug("Financial ratios API success with TR_ID: %s", tr_id)
+                return result
+            logger.debug("Financial ratios API failed with TR_ID %s: %s", tr_id, (result or {}).get('msg1', 'Unknown error'))
+            last_error = result
+
         # 모든 TR_ID 실패 시 마지막 에러 반환
         logger.warning(f"All financial ratio TR_IDs failed for {stock_code}")
         return last_error or {"rt_cd": "1", "msg1": "All financial ratio APIs failed"}
     
-    async def calculate_pbr(self, stock_code: str) -> Optional[float]:
-        """PBR 계산 (주가순자산비율) - 새로운 재무지표 API 사용"""
-        try:
-            # 재무비율 API로 직접 조회
-            financial_data = await self.get_financial_ratios(stock_code)
-            if financial_data and financial_data.get('rt_cd') == '0':
-                output = financial_data.get('output', {})
-
-                # PBR이 직접 제공되는지 확인
-                for pbr_key in ['pbr', 'per_pbr', 'stck_pbpr']:
-                    pbr_value = output.get(pbr_key)
-                    if pbr_value and pbr_value != '0' and pbr_value != '-':
-                        try:
-                            pbr = float(pbr_value)
-                            if 0.01 <= pbr <= 15.0:  # 합리적 범위
-                                logger.debug(f"Direct PBR for {stock_code}: {pbr:.2f}")
-                                return pbr
-                        except (ValueError, TypeError):
-                            continue
-
-            # 폴백: 기존 방식으로 계산
-            logger.debug(f"Falling back to manual PBR calculation for {stock_code}")
-            price_data = await self.get_current_price(stock_code)
-            if not price_data or price_data.get('rt_cd') != '0':
-                return None
+    def _financial_ratio_params(self, tr_id: str, stock_code: str) -> Dict:
+        """재무비율 조회용 TR_ID별 요청 파라미터"""
+        if tr_id == "FHKST03010100":
+            # 일봉 데이터 파라미터
+            today = datetime.now().strftime("%Y%m%d")
+            return {
+                "fid_cond_mrkt_div_code": "J",
+                "fid_input_iscd": stock_code,
+                "fid_input_date_1": today,
+                "fid_input_date_2": today,
+                "fid_period_div_code": "D",
+                "fid_org_adj_prc": "1"
+            }
+        elif tr_id == "FHKST01010100":
+            # 현재가 시세 파라미터
+            return {
+                "fid_cond_mrkt_div_code": "J",
+                "fid_input_iscd": stock_code
+            }
+        else:
+            # 기본 재무 관련 파라미터
+            return {
+                "fid_cond_mrkt_div_code": "J",
+                "fid_input_iscd": stock_code,
+                "fid_input_date_1": "",
+            }
 
-            current_price = float(price_data['output'].get('stck_prpr', 0))
-            if current_price <= 0:
-                return None
+    async def get_all_ratios(self, stock_code: str) -> Dict[str, Optional[float]]:
+        """재무비율 API 1회 호출로 PBR/PER/ROE/PSR 일괄 추출 (값이 없거나 범위 밖이면 None)"""
+        return _ratios_from_response(await self.get_financial_ratios(stock_code))
+
+    def _ratio_known_missing(self, stock_code: str, metric: str) -> bool:
+        """최근에 데이터 부족으로 계산하지 못한 지표인지 여부 (재시도 시각이 지난 항목은 제거)"""
+        negative_key = (stock_code, metric)
+        retry_at = self._negative_ratio_cache.get(negative_key)
+        if retry_at is None:
+            return False
+        if time.monotonic() < retry_at:
+            return True
+        del self._negative_ratio_cache[negative_key]
+        return False
+
+    def _remember_missing_ratio(self, stock_code: str, metric: str, fields: Optional[OverviewFields],
+                                financial_data: Optional[Dict]):
+        """종목 개요와 재무비율 API가 모두 정상 응답했는데도 지표를 구할 수 없으면 일정 시간 재조회 생략
+
+        재무비율 API가 실패한 경우(일시적 장애일 수 있음)에는 기록하지 않는다.
+        """
+        if not financial_data or financial_data.get('rt_cd') != '0':
+            return
+        if _lacks_ratio_inputs(fields, _ratios_from_response(financial_data), metric):
+            logger.debug("Insufficient data for %s %s, skipping for %ds", stock_code, metric.upper(), _NEGATIVE_RATIO_TTL)
+            self._negative_ratio_cache[(stock_code, metric)] = time.monotonic() + _NEGATIVE_RATIO_TTL
 
-            # BPS 정보 조회 시도
-            overview_data = await self.get_stock_overview(stock_code)
-            if overview_data and overview_data.get('rt_cd') == '0':
-                output = overview_data.get('output', {})
-                bps = output.get('bps')
-                if bps and float(bps) > 0:
-                    pbr = current_price / float(bps)
-                    if 0.01 <= pbr <= 15.0:
-                        logger.debug(f"Calculated PBR for {stock_code}: {pbr:.2f}")
-                        return pbr
+    async def _calc_ratio(self, stock_code: str, metric: str, manual_func) -> Optional[float]:
+        """재무비율 공통 계산: 종목 개요 값 → 재무비율 API 직접 값 → manual_func 계산 순"""
+        label = metric.upper()
+        unit = '%' if metric == 'roe' else ''
 
+        # 최근에 데이터 부족으로 계산하지 못한 종목은 재시도 시각 전까지 바로 None 반환
+        if self._ratio_known_missing(stock_code, metric):
             return None
 
-        except Exception as e:
-            logger.error(f"Error calculating PBR for {stock_code}: {e}")
-            return None
-    
-    async def calculate_per(self, stock_code: str) -> Optional[float]:
-        """PER 계산 (주가수익비율) - 새로운 재무지표 API 사용"""
         try:
-            # 재무비율 API로 직접 조회
+            # 종목 개요(메모리/디스크 캐시)에 지표가 있으면 재무비율 API 조회 없이 바로 사용
+            fields = await self.get_overview_fields(stock_code)
+            value = _overview_ratio(fields, metric)
+            if value is not None:
+                logger.debug("Overview %s for %s: %.2f%s", label, stock_code, value, unit)
+                return value
+
+            # 재무비율 API로 직접 조회 (한 번의 호출로 4개 지표 일괄 추출)
             financial_data = await self.get_financial_ratios(stock_code)
-            if financial_data and financial_data.get('rt_cd') == '0':
-                output = financial_data.get('output', {})
-
-                # PER이 직접 제공되는지 확인
-                for per_key in ['per', 'stck_per', 'per_ratio']:
-                    per_value = output.get(per_key)
-                    if per_value and per_value != '0' and per_value != '-':
-                        try:
-                            per = float(per_value)
-                            if 0.1 <= per <= 300.0:  # 합리적 범위
-                                logger.debug(f"Direct PER for {stock_code}: {per:.2f}")
-                                return per
-                        except (ValueError, TypeError):
-                            continue
+            value = _ratios_from_response(financial_data)[metric]
+            if value is not None:
+                logger.debug("Direct %s for %s: %.2f%s", label, stock_code, value, unit)
+                return value
 
             # 폴백: 기존 방식으로 계산
-            logger.debug(f"Falling back to manual PER calculation for {stock_code}")
-            price_data = await self.get_current_price(stock_code)
-            if not price_data or price_data.get('rt_cd') != '0':
-                return None
+            logger.debug("Falling back to manual %s calculation for %s", label, stock_code)
+            value = await manual_func(stock_code, metric)
+            if value is None:
+                self._remember_missing_ratio(stock_code, metric, fields, financial_data)
+            return value
 
-            current_price = float(price_data['output'].get('stck_prpr', 0))
-            if current_price <= 0:
-                return None
-
-            # EPS 정보 조회 시도
-            overview_data = await self.get_stock_overview(stock_code)
-            if overview_data and overview_data.get('rt_cd') == '0':
-                output = overview_data.get('output', {})
-                eps = output.get('eps')
-                if eps and float(eps) > 0:
-                    per = current_price / float(eps)
-                    if 0.1 <= per <= 300.0:
-                        logger.debug(f"Calculated PER for {stock_code}: {per:.2f}")
-                        return per
-
-            return None
-            
         except Exception as e:
-            logger.error(f"Error calculating PER for {stock_code}: {e}")
+            logger.error(f"Error calculating {label} for {stock_code}: {e}")
             return None
-    
-    async def calculate_roe(self, stock_code: str) -> Optional[float]:
-        """ROE 계산 (자기자본이익률, %) - 새로운 재무지표 API 사용"""
+
+    async def _manual_per_share_ratio(self, stock_code: str, metric: str) -> Optional[float]:
+        """현재가 / 주당 지표(BPS, EPS, SPS)로 PBR, PER, PSR 계산"""
+        # 현재가와 주당 지표(종목 개요)는 서로 독립적이므로 동시에 조회
+        price_data, fields = await asyncio.gather(
+            self.get_current_price(stock_code),
+            self.get_overview_fields(stock_code)
+        )
+        # 주당 지표 정보로 계산
+        value = _per_share_ratio(fields, _parse_current_price(price_data), metric)
+        if value is not None:
+            logger.debug("Calculated %s for %s: %.2f", metric.upper(), stock_code, value)
+        return value
+
+    async def _estimate_roe(self, stock_code: str, metric: str = 'roe') -> Optional[float]:
+        """PBR과 PER을 이용한 ROE 추정
+
+        calculate_pbr/calculate_per를 다시 호출하지 않고, 같은 순서(종목 개요 → 재무비율 API → 주당 지표 계산)로
+        이미 조회한 응답(단기 캐시)에서 두 지표를 구한다.
+        """
+        ratios, price_data, fields = await asyncio.gather(
+            self.get_all_ratios(stock_code),
+            self.get_current_price(stock_code),
+            self.get_overview_fields(stock_code)
+        )
+        if fields is not None:
+            current_price = _parse_current_price(price_data)
+            pbr = _overview_ratio(fields, 'pbr') or ratios['pbr'] or _per_share_ratio(fields, current_price, 'pbr')
+            per = _overview_ratio(fields, 'per') or ratios['per'] or _per_share_ratio(fields, current_price, 'per')
+
+            estimated_roe = _estimate_roe_from_ratios(pbr, per)
+            if estimated_roe is not None:
+                logger.debug("Estimated ROE for %s: %.2f%%", stock_code, estimated_roe)
+                return estimated_roe
+
+        return None
+
+    async def calculate_all_ratios(self, stock_code: str) -> Dict[str, Optional[float]]:
+        """PBR/PER/ROE/PSR 일괄 계산 (각 응답을 한 번씩만 조회해 네 지표를 함께 계산)
+
+        지표별 우선순위는 calculate_* 와 같다: 종목 개요 값 → 재무비율 API 값 → 현재가/주당 지표 계산
+        (ROE는 PBR/PER 추정). 종목 개요만으로 네 지표가 모두 채워지면 추가 조회를 하지 않는다.
+        """
+        result: Dict[str, Optional[float]] = {'pbr': None, 'per': None, 'roe': None, 'psr': None}
         try:
-            # 재무비율 API로 직접 조회
-            financial_data = await self.get_financial_ratios(stock_code)
-            if financial_data and financial_data.get('rt_cd') == '0':
-                output = financial_data.get('output', {})
+            fields = await self.get_overview_fields(stock_code)
+            for metric in result:
+                result[metric] = _overview_ratio(fields, metric)
+            if None not in result.values():
+                return result
+            # 남은 지표가 모두 최근에 데이터 부족으로 계산하지 못한 지표면 추가 조회 생략
+            if all(self._ratio_known_missing(stock_code, metric) for metric, value in result.items() if value is None):
+                return result
+
+            financial_data, price_data = await asyncio.gather(
+                self.get_financial_ratios(stock_code),
+                self.get_current_price(stock_code)
+            )
+            ratios = _ratios_from_response(financial_data)
+            current_price = _parse_current_price(price_data)
+            for metric in ('pbr', 'per', 'psr'):
+                if result[metric] is None:
+                    result[metric] = ratios[metric]
+                if result[metric] is None:
+                    result[metric] = _per_share_ratio(fields, current_price, metric)
+
+            if result['roe'] is None:
+                result['roe'] = ratios['roe']
+            if result['roe'] is None and fields is not None:
+                result['roe'] = _estimate_roe_from_ratios(result['pbr'], result['per'])
+
+            for metric, value in result.items():
+                if value is None:
+                    self._remember_missing_ratio(stock_code, metric, fields, financial_data)
 
-                # ROE가 직접 제공되는지 확인
-                for roe_key in ['roe', 'stck_roe', 'return_on_equity']:
-                    roe_value = output.get(roe_key)
-                    if roe_value and roe_value != '0' and roe_value != '-':
-                        try:
-                            roe = float(roe_value)
-                            if -100.0 <= roe <= 150.0:  # 합리적 범위
-                                logger.debug(f"Direct ROE for {stock_code}: {roe:.2f}%")
-                                return roe
-                        except (ValueError, TypeError):
-                            continue
+        except Exception as e:
+            logger.error(f"Error calculating ratios for {stock_code}: {e}")
 
-            # 폴백: 기존 방식으로 계산
-            logger.debug(f"Falling back to manual ROE calculation for {stock_code}")
-            overview_data = await self.get_stock_overview(stock_code)
-            if overview_data and overview_data.get('rt_cd') == '0':
-                output = overview_data.get('output', {})
+        return result
 
-                # PBR과 PER을 이용한 ROE 추정
-                pbr = await self.calculate_pbr(stock_code)
-                per = await self.calculate_per(stock_code)
+    async def calculate_pbr(self, stock_code: str) -> Optional[float]:
+        """PBR 계산 (주가순자산비율) - 새로운 재무지표 API 사용"""
+        return await self._calc_ratio(stock_code, 'pbr', self._manual_per_share_ratio)
 
-                if pbr and per and pbr > 0 and per > 0:
-                    estimated_roe = (1 / per) * (1 / pbr) * 100
-                    if -50.0 <= estimated_roe <= 100.0:
-                        logger.debug(f"Estimated ROE for {stock_code}: {estimated_roe:.2f}%")
-                        return estimated_roe
+    async def calculate_per(self, stock_code: str) -> Optional[float]:
+        """PER 계산 (주가수익비율) - 새로운 재무지표 API 사용"""
+        return await self._calc_ratio(stock_code, 'per', self._manual_per_share_ratio)
 
-            return None
+    async def calculate_roe(self, stock_code: str) -> Optional[float]:
+        """ROE 계산 (자기자본이익률, %) - 새로운 재무지표 API 사용"""
+        return await self._calc_ratio(stock_code, 'roe', self._estimate_roe)
 
-        except Exception as e:
-            logger.error(f"Error calculating ROE for {stock_code}: {e}")
-            return None
-    
     async def calculate_psr(self, stock_code: str) -> Optional[float]:
         """PSR 계산 (주가매출액비율) - 새로운 재무지표 API 사용"""
-        try:
-            # 재무비율 API로 직접 조회
-            financial_data = await self.get_financial_ratios(stock_code)
-            if financial_data and financial_data.get('rt_cd') == '0':
-                output = financial_data.get('output', {})
-
-                # PSR이 직접 제공되는지 확인
-                for psr_key in ['psr', 'stck_psr', 'price_to_sales']:
-                    psr_value = output.get(psr_key)
-                    if psr_value and psr_value != '0' and psr_value != '-':
-                        try:
-                            psr = float(psr_value)
-                            if 0.01 <= psr <= 30.0:  # 합리적 범위
-                                logger.debug(f"Direct PSR for {stock_code}: {psr:.2f}")
-                                return psr
-                        except (ValueError, TypeError):
-                            continue
-
-            # 폴백: 기존 방식으로 계산
-            logger.debug(f"Falling back to manual PSR calculation for {stock_code}")
-            price_data = await self.get_current_price(stock_code)
-            if not price_data or price_data.get('rt_cd') != '0':
-                return None
-
-            current_price = float(price_data['output'].get('stck_prpr', 0))
-            if current_price <= 0:
-                return None
-
-            # SPS(주당매출액) 정보 조회 시도
-            overview_data = await self.get_stock_overview(stock_code)
-            if overview_data and overview_data.get('rt_cd') == '0':
-                output = overview_data.get('output', {})
-                sps = output.get('sps') or output.get('sales_per_share')
-                if sps and float(sps) > 0:
-                    psr = current_price / float(sps)
-                    if 0.01 <= psr <= 30.0:
-                        logger.debug(f"Calculated PSR for {stock_code}: {psr:.2f}")
-                        return psr
+        return await self._calc_ratio(stock_code, 'psr', self._manual_per_share_ratio)
 
-            return None
-
-        except Exception as e:
-            logger.error(f"Error calculating PSR for {stock_code}: {e}")
-            return None
+    def _cached_overview_ratio(self, stock_code: str, metric: str) -> Optional[float]:
+        """메모리에 유지 중인 종목 개요에 지표가 있으면 바로 반환 (조회 없이 동기 확인)"""
+        return _overview_ratio(self._response_cache.get(f"overview_fields:{stock_code}"), metric)
 
     # 캐싱 및 폴백 로직이 적용된 메서드들
     async def get_per_cached(self, stock_code: str) -> Optional[float]:
         """PER 조회 (캐싱 + 폴백 로직 적용)"""
+        value = self._cached_overview_ratio(stock_code, 'per')
+        if value is not None:
+            return value
         if self.data_manager:
             return await self.data_manager.get_per_with_fallback(stock_code)
         else:
@@ -1133,6 +1964,9 @@ class KISAPIClient:
 
     async def get_roe_cached(self, stock_code: str) -> Optional[float]:
         """ROE 조회 (캐싱 + 폴백 로직 적용)"""
+        value = self._cached_overview_ratio(stock_code, 'roe')
+        if value is not None:
+            return value
         if self.data_manager:
             return await self.data_manager.get_roe_with_fallback(stock_code)
         else:
@@ -1140,6 +1974,9 @@ class KISAPIClient:
 
     async def get_psr_cached(self, stock_code: str) -> Optional[float]:
         """PSR 조회 (캐싱 + 폴백 로직 적용)"""
+        value = self._cached_overview_ratio(stock_code, 'psr')
+        if value is not None:
+            return value
         if self.data_manager:
             return await self.data_manager.get_psr_with_fallback(stock_code)
         else:
@@ -1147,11 +1984,55 @@ class KISAPIClient:
 
     async def get_pbr_cached(self, stock_code: str) -> Optional[float]:
         """PBR 조회 (캐싱 + 폴백 로직 적용)"""
+        value = self._cached_overview_ratio(stock_code, 'pbr')
+        if value is not None:
+            return value
         if self.data_manager:
             return await self.data_manager.get_pbr_with_fallback(stock_code)
         else:
             return await self.calculate_pbr(stock_code)
 
+    async def get_all_indicators_cached(self, stock_code: str) -> Dict[str, Optional[float]]:
+        """PBR/PER/ROE/PSR 일괄 조회 (캐싱 + 폴백 로직 적용)"""
+        indicators = {metric: self._cached_overview_ratio(stock_code, metric)
+                      for metric in ('pbr', 'per', 'roe', 'psr')}
+        if None not in indicators.values():
+            return indicators
+
+        if self.data_manager:
+            return await self.data_manager.get_all_ratios_with_fallback(stock_code)
+        return await self.calculate_all_ratios(stock_code)
+
+    async def get_indicators_for_universe(self, stock_codes: List[str],
+                                          concurrency: int = _INDICATOR_CONCURRENCY) -> Dict[str, Dict[str, Optional[float]]]:
+        """여러 종목의 밸류에이션 지표 일괄 조회 (동시 처리 종목 수 제한, 초당 호출 수는 throttler가 제한)"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(stock_code: str):
+            async with semaphore:
+                return stock_code, await self.get_all_indicators_cached(stock_code)
+
+        results = await _gather_eager(fetch(stock_code) for stock_code in stock_codes)
+        return dict(results)
+
+    async def calculate_ratios_bulk(self, stock_codes: List[str],
+                                    concurrency: int = _INDICATOR_CONCURRENCY) -> Dict[str, np.ndarray]:
+        """여러 종목의 현재가와 종목 개요를 조회한 뒤 PBR/PER/ROE/PSR을 한 번에 계산 (stock_codes 순서의 배열, 없으면 NaN)"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(stock_code: str):
+            async with semaphore:
+                price_data, fields = await asyncio.gather(
+                    self.get_current_price(stock_code),
+                    self.get_overview_fields(stock_code)
+                )
+            price = _parse_current_price(price_data)
+            return (np.nan if price is None else price), fields
+
+        results = await _gather_eager(fetch(stock_code) for stock_code in stock_codes)
+        prices = np.fromiter((price for price, _ in results), dtype=np.float64, count=len(results))
+        return compute_ratios_bulk([fields for _, fields in results], prices)
+
     def get_cache_stats(self) -> Dict:
         """캐시 통계 조회"""
         if self.data_manager:
@@ -1160,6 +2041,15 @@ class KISAPIClient:
 
     def cleanup_cache(self):
         """만료된 캐시 정리"""
+        self._response_cache.clear_expired()
+        now = time.monotonic()
+        self._negative_ratio_cache = {
+            key: retry_at for key, retry_at in self._negative_ratio_cache.items() if retry_at > now
+        }
+        if self._disk_cache is not None:
+            # 조회할 때와 같은 TTL로 키 종류별 정리
+            for key_prefix, ttl in _DISK_CACHE_TTLS:
+                self._disk_cache.cleanup_expired(ttl, key_prefix)
         if self.data_manager:
             self.data_manager.cleanup_cache()
 
@@ -1,4 +1,5 @@
 from .financial_data_cache import FinancialDataCache, CachedFinancialData
 from .financial_data_manager import FinancialDataManager
+from .response_cache import ResponseCache
 
-__all__ = ['FinancialDataCache', 'CachedFinancialData', 'FinancialDataManager']
\ No newline at end of file
+__all__ = ['FinancialDataCache', 'CachedFinancialData', 'FinancialDataManager', 'ResponseCache']
\ No newline at end of file
@@ -1,22 +1,96 @@
 import sqlite3
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from dataclasses import dataclass
+import numpy as np
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+from dataclasses import dataclass, replace
+from contextlib import contextmanager
 import threading
+from collections import OrderedDict
+import atexit
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# 연결마다 적용하는 PRAGMA (journal_mode=WAL은 DB 파일에 유지되므로 _init_db에서 한 번만 설정)
+# - synchronous=NORMAL: WAL에서는 커밋당 fsync 1회로 충분 (전원 장애 시 마지막 커밋만 유실 가능)
+# - temp_store/cache_size/mmap_size: 임시 테이블은 메모리, 페이지 캐시 약 20MB, 256MB 메모리 매핑
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA wal_autocheckpoint=1000",
+    "PRAGMA secure_delete=OFF",  # 삭제한 페이지를 0으로 덮어쓰지 않음
+)
+
+# 캐시 SQL (연결의 문장 캐시는 SQL 문자열 기준이므로 모든 호출이 같은 상수를 사용,
+# 조회는 created_at 없이 필요한 컬럼만 선택)
+_SQL_CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS financial_cache (
+        stock_code TEXT PRIMARY KEY,
+        per REAL,
+        roe REAL,
+        psr REAL,
+        pbr REAL,
+        cached_at INTEGER NOT NULL,  -- Unix epoch(초)
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    ) WITHOUT ROWID
+"""
+_SQL_COLUMNS = "stock_code, per, roe, psr, pbr, cached_at"
+_SQL_GET = f"SELECT {_SQL_COLUMNS} FROM financial_cache WHERE stock_code = ? AND cached_at > ?"
+_SQL_GET_ANY = f"SELECT {_SQL_COLUMNS} FROM financial_cache WHERE stock_code = ? ORDER BY cached_at DESC LIMIT 1"
+# IN 조건 일괄 조회 (자리표시자는 호출 시 채움, 구버전 SQLite 바인딩 변수 한도 999 아래로 나눠 실행)
+_SQL_GET_MANY = f"SELECT {_SQL_COLUMNS} FROM financial_cache WHERE cached_at > ? AND stock_code IN (%s)"
+_SQL_IN_CHUNK_SIZE = 900
+_SQL_UPSERT = f"INSERT OR REPLACE INTO financial_cache ({_SQL_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)"
+# 만료 항목을 cached_at 인덱스로 골라 묶음 단위로 삭제
+_SQL_DELETE_OLDER = (
+    "DELETE FROM financial_cache WHERE stock_code IN "
+    "(SELECT stock_code FROM financial_cache WHERE cached_at < ? LIMIT ?)"
+)
+_CLEANUP_CHUNK_SIZE = 500
+_SQL_COUNT = "SELECT COUNT(*) FROM financial_cache"
+_SQL_COUNT_VALID = "SELECT COUNT(*) FROM financial_cache WHERE cached_at > ?"
+_STATEMENT_CACHE_SIZE = 256  # 연결별 컴파일된 문장 캐시 크기 (sqlite3 기본값 128)
+
+# update_metric 변경분 일괄 저장 주기(초)와 즉시 저장을 시작하는 대기 건수
+_FLUSH_INTERVAL = 1.0
+_FLUSH_BATCH_SIZE = 500
+
+# SQLite 앞단 메모리 캐시 최대 항목 수 (초과 시 가장 오래 사용하지 않은 항목부터 제거)
+_MEMORY_CACHE_MAX_SIZE = 10_000
+
+# 일괄 배열 조회용 SQL (지표 배열은 종목코드 순서와 같은 순서)
+_SQL_GET_ALL_VALID = "SELECT stock_code, per, roe, psr, pbr FROM financial_cache WHERE cached_at > ?"
+
+@dataclass(init=False)
 class CachedFinancialData:
-    """금융 데이터 캐시 항목"""
+    """금융 데이터 캐시 항목
+
+    수천 종목을 메모리에 들고 있으므로 인스턴스별 __dict__ 없이 __slots__로 생성한다.
+    (dataclass의 slots 옵션은 Python 3.10+ 전용이라 직접 선언, 클래스 속성 기본값과
+    __slots__는 함께 쓸 수 없으므로 기본값은 __init__에서 지정)
+    """
+    __slots__ = ('stock_code', 'per', 'roe', 'psr', 'pbr', 'cached_at')
+
     stock_code: str
-    per: Optional[float] = None
-    roe: Optional[float] = None
-    psr: Optional[float] = None
-    pbr: Optional[float] = None
-    cached_at: datetime = None
+    per: Optional[float]
+    roe: Optional[float]
+    psr: Optional[float]
+    pbr: Optional[float]
+    cached_at: Optional[datetime]
+
+    def __init__(self, stock_code: str, per: Optional[float] = None, roe: Optional[float] = None,
+                 psr: Optional[float] = None, pbr: Optional[float] = None,
+                 cached_at: Optional[datetime] = None):
+        self.stock_code = stock_code
+        self.per = per
+        self.roe = roe
+        self.psr = psr
+        self.pbr = pbr
+        self.cached_at = cached_at
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -30,9 +104,15 @@ class CachedFinancialData:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'CachedFinancialData':
-        cached_at = None
-        if data.get('cached_at'):
-            cached_at = datetime.fromisoformat(data['cached_at'])
+        cached_at = data.get('cached_at')
+        if cached_at:
+            # DB에는 Unix epoch(초) 정수로 저장, to_dict 결과는 ISO 문자열
+            if isinstance(cached_at, str):
+                cached_at = datetime.fromisoformat(cached_at)
+            else:
+                cached_at = datetime.fromtimestamp(cached_at)
+        else:
+            cached_at = None
 
         return cls(
             stock_code=data['stock_code'],
@@ -43,32 +123,131 @@ class CachedFinancialData:
             cached_at=cached_at
         )
 
+# DB에 저장된 epoch 초 -> datetime
+_decode_ts = datetime.fromtimestamp
+
+def _row_to_data(row: Tuple) -> CachedFinancialData:
+    """_SQL_COLUMNS 순서의 조회 결과 행을 위치 기준으로 바로 변환 (dict 변환/키 조회 생략)"""
+    return CachedFinancialData(row[0], row[1], row[2], row[3], row[4], _decode_ts(row[5]))
+
+class _RWLock:
+    """읽기-쓰기 잠금 (읽기는 동시에 여러 개, 쓰기는 단독; 쓰기 대기 중에는 새 읽기를 받지 않음)"""
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read_lock(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write_lock(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
 class FinancialDataCache:
     """금융 데이터 캐시 관리자"""
 
     def __init__(self, db_path: str = "data/financial_cache.db", cache_hours: int = 24):
         self.db_path = db_path
         self.cache_hours = cache_hours
-        self._lock = threading.Lock()
+        # WAL에서는 읽기끼리 서로 막지 않으므로 읽기는 공유, 쓰기만 단독으로 잠금
+        self._rw = _RWLock()
+        # 호출마다 DB 파일(-wal/-shm 포함)을 다시 열지 않도록 연결을 계속 유지
+        # (쓰기 연결 1개 + 스레드별 읽기 연결, SQLite 연결은 스레드 간 동시 사용 불가)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._local = threading.local()
+        self._reader_conns: List[sqlite3.Connection] = []
+        self._reader_conns_lock = threading.Lock()
+        # update_metric 변경분은 메모리에 모아 두었다가 백그라운드 스레드가 한 트랜잭션으로 저장
+        # (잠금 순서: self._rw 쓰기 잠금 -> self._pending_lock)
+        self._pending: Dict[str, CachedFinancialData] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_event = threading.Event()
+        # 조회 결과 메모리 캐시: 종목코드 -> (데이터, 만료 시각(epoch 초)), LRU 순서 유지
+        self._mem: "OrderedDict[str, Tuple[CachedFinancialData, float]]" = OrderedDict()
+        self._mem_lock = threading.Lock()
+        self._closed = False
+        # 저장 스레드는 첫 update_metric 호출 때 시작 (조회만 하는 인스턴스는 스레드/atexit 등록 없음)
+        self._flusher: Optional[threading.Thread] = None
+        self._flusher_lock = threading.Lock()
         self._init_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        """PRAGMA를 적용한 데이터베이스 연결 생성 (여러 스레드에서 쓰므로 스레드 검사 해제)"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=_STATEMENT_CACHE_SIZE)
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _reader_conn(self) -> sqlite3.Connection:
+        """현재 스레드의 읽기 전용 연결 (처음 사용할 때 생성)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._reader_conns_lock:
+                self._reader_conns.append(conn)
+        return conn
+
+    def close(self):
+        """대기 중인 변경분을 저장하고 유지 중인 데이터베이스 연결 종료"""
+        with self._flusher_lock:
+            if self._closed:
+                return
+            self._closed = True
+            flusher = self._flusher
+            self._flusher = None
+        if flusher is not None:
+            atexit.unregister(self.close)
+            self._flush_event.set()
+            flusher.join()
+        self.flush()
+
+        with self._rw.write_lock():
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            with self._reader_conns_lock:
+                for conn in self._reader_conns:
+                    conn.close()
+                self._reader_conns.clear()
+
     def _init_db(self):
         """데이터베이스 초기화"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS financial_cache (
-                        stock_code TEXT PRIMARY KEY,
-                        per REAL,
-                        roe REAL,
-                        psr REAL,
-                        pbr REAL,
-                        cached_at TEXT NOT NULL,
-                        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-
-                # 인덱스 생성
+            self._conn = self._connect()
+            with self._conn as conn:
+                # 읽기가 쓰기에 막히지 않도록 WAL 모드 사용 (DB 파일에 저장되어 이후 연결에도 유지)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(_SQL_CREATE_TABLE)
+                self._migrate_schema(conn)
+
+                # 인덱스 생성 (종목코드 조회는 기본키로 행 전체를 바로 읽으므로 추가 인덱스 불필요,
+                # cached_at 인덱스는 만료 정리/통계의 범위 조건용)
                 conn.execute("""
                     CREATE INDEX IF NOT EXISTS idx_cached_at
                     ON financial_cache(cached_at)
@@ -81,31 +260,98 @@ class FinancialDataCache:
             logger.error(f"Failed to initialize cache database: {e}")
             raise
 
+    def _migrate_schema(self, conn: sqlite3.Connection):
+        """이전 형식 테이블을 현재 스키마로 재구성
+
+        - cached_at을 ISO 문자열(TEXT)로 저장하던 테이블 -> epoch 정수(INTEGER) 컬럼
+        - rowid 테이블 -> stock_code 기본키로 정렬 저장되는 WITHOUT ROWID 테이블
+        SQLite는 컬럼 타입/테이블 형식 변경을 지원하지 않으므로 새 테이블로 옮겨 담는다.
+        (ISO 값은 로컬 시각이므로 SQL strftime 대신 Python에서 변환)
+        """
+        table_sql = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'financial_cache'"
+        ).fetchone()[0]
+        columns = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(financial_cache)")}
+        text_cached_at = columns.get('cached_at', '').upper() == 'TEXT'
+        if not text_cached_at and 'WITHOUT ROWID' in table_sql.upper():
+            return
+
+        rows = conn.execute(
+            "SELECT stock_code, per, roe, psr, pbr, cached_at, created_at FROM financial_cache"
+        ).fetchall()
+        conn.execute("DROP TABLE financial_cache")
+        conn.execute(_SQL_CREATE_TABLE)
+        conn.executemany(
+            "INSERT INTO financial_cache (stock_code, per, roe, psr, pbr, cached_at, created_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (row[0], row[1], row[2], row[3], row[4],
+                 int(datetime.fromisoformat(row[5]).timestamp()) if isinstance(row[5], str) else row[5],
+                 row[6])
+                for row in rows
+            ]
+        )
+        logger.info(f"Migrated {len(rows)} financial cache entries to the current table schema")
+
+    def _mem_get(self, stock_code: str) -> Optional[CachedFinancialData]:
+        """메모리 캐시 조회 (만료된 항목은 삭제)"""
+        with self._mem_lock:
+            entry = self._mem.get(stock_code)
+            if entry is None:
+                return None
+            if time.time() >= entry[1]:
+                del self._mem[stock_code]
+                return None
+            self._mem.move_to_end(stock_code)
+        # 호출자가 수정해도 캐시 항목은 바뀌지 않도록 복사본 반환
+        return replace(entry[0])
+
+    def _mem_put(self, data: CachedFinancialData):
+        """DB에서 읽은 항목을 메모리 캐시에 저장"""
+        expires_at = data.cached_at.timestamp() + self.cache_hours * 3600
+        with self._mem_lock:
+            self._mem[data.stock_code] = (data, expires_at)
+            self._mem.move_to_end(data.stock_code)
+            if len(self._mem) > _MEMORY_CACHE_MAX_SIZE:
+                self._mem.popitem(last=False)
+
+    def _mem_discard(self, stock_codes: Iterable[str]):
+        """변경된 종목의 메모리 캐시 항목 제거"""
+        with self._mem_lock:
+            for stock_code in stock_codes:
+                self._mem.pop(stock_code, None)
+
     def get_cached_data(self, stock_code: str) -> Optional[CachedFinancialData]:
-        """캐시된 데이터 조회"""
+        """캐시된 데이터 조회 (아직 저장되지 않은 최신 변경분 -> 메모리 캐시 -> DB 순)"""
         try:
-            with self._lock:
-                with sqlite3.connect(self.db_path) as conn:
-                    conn.row_factory = sqlite3.Row
-                    cursor = conn.cursor()
+            with self._pending_lock:
+                pending = self._pending.get(stock_code)
+            if pending is not None:
+                logger.debug("Cache hit for %s (pending): %s", stock_code, pending)
+                return replace(pending)
+
+            cached_data = self._mem_get(stock_code)
+            if cached_data is not None:
+                logger.debug("Cache hit for %s (memory): %s", stock_code, cached_data)
+                return cached_data
 
-                    # 캐시 유효 시간 계산
-                    cutoff_time = datetime.now() - timedelta(hours=self.cache_hours)
+            with self._rw.read_lock():
+                cursor = self._reader_conn().cursor()
 
-                    cursor.execute("""
-                        SELECT * FROM financial_cache
-                        WHERE stock_code = ? AND cached_at > ?
-                    """, (stock_code, cutoff_time.isoformat()))
+                # 캐시 유효 시간 계산
+                cutoff_time = int(time.time() - self.cache_hours * 3600)
 
-                    row = cursor.fetchone()
-                    if row:
-                        data = dict(row)
-                        cached_data = CachedFinancialData.from_dict(data)
-                        logger.debug(f"Cache hit for {stock_code}: {cached_data}")
-                        return cached_data
+                cursor.execute(_SQL_GET, (stock_code, cutoff_time))
 
-                    logger.debug(f"Cache miss for {stock_code}")
-                    return None
+                row = cursor.fetchone()
+                if row:
+                    cached_data = _row_to_data(row)
+                    self._mem_put(replace(cached_data))
+                    logger.debug("Cache hit for %s: %s", stock_code, cached_data)
+                    return cached_data
+
+                logger.debug("Cache miss for %s", stock_code)
+                return None
 
         except Exception as e:
             logger.error(f"Error getting cached data for {stock_code}: {e}")
@@ -114,30 +360,131 @@ class FinancialDataCache:
     def set_cached_data(self, data: CachedFinancialData):
         """데이터 캐시 저장"""
         try:
-            with self._lock:
-                with sqlite3.connect(self.db_path) as conn:
-                    if data.cached_at is None:
-                        data.cached_at = datetime.now()
-
-                    conn.execute("""
-                        INSERT OR REPLACE INTO financial_cache
-                        (stock_code, per, roe, psr, pbr, cached_at)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (
-                        data.stock_code,
-                        data.per,
-                        data.roe,
-                        data.psr,
-                        data.pbr,
-                        data.cached_at.isoformat()
-                    ))
-
-                    conn.commit()
-                    logger.debug(f"Cached data for {data.stock_code}: PER={data.per}, ROE={data.roe}, PSR={data.psr}")
+            with self._rw.write_lock():
+                # 직접 저장하는 값이 최신이므로 대기 중인 변경분은 버림
+                with self._pending_lock:
+                    self._pending.pop(data.stock_code, None)
+                self._mem_discard((data.stock_code,))
+
+                conn = self._conn
+                if data.cached_at is None:
+                    data.cached_at = datetime.now()
+
+                conn.execute(_SQL_UPSERT, (
+                    data.stock_code,
+                    data.per,
+                    data.roe,
+                    data.psr,
+                    data.pbr,
+                    int(data.cached_at.timestamp())
+                ))
+
+                conn.commit()
+                logger.debug("Cached data for %s: PER=%s, ROE=%s, PSR=%s", data.stock_code, data.per, data.roe, data.psr)
 
         except Exception as e:
             logger.error(f"Error caching data for {data.stock_code}: {e}")
 
+    def get_cached_data_many(self, stock_codes: List[str]) -> Dict[str, CachedFinancialData]:
+        """여러 종목 캐시 일괄 조회 (결과에 없는 종목은 캐시 미스)
+
+        IN 조건 쿼리 한 번으로 조회하되, SQLite 바인딩 변수 한도 안에서 나눠 실행한다.
+        """
+        result: Dict[str, CachedFinancialData] = {}
+        try:
+            with self._pending_lock:
+                for stock_code in stock_codes:
+                    pending = self._pending.get(stock_code)
+                    if pending is not None:
+                        result[stock_code] = replace(pending)
+            for stock_code in stock_codes:
+                if stock_code not in result:
+                    cached_data = self._mem_get(stock_code)
+                    if cached_data is not None:
+                        result[stock_code] = cached_data
+            remaining = [stock_code for stock_code in dict.fromkeys(stock_codes) if stock_code not in result]
+            if not remaining:
+                return result
+
+            with self._rw.read_lock():
+                cursor = self._reader_conn().cursor()
+                cutoff_time = int(time.time() - self.cache_hours * 3600)
+
+                for start in range(0, len(remaining), _SQL_IN_CHUNK_SIZE):
+                    chunk = remaining[start:start + _SQL_IN_CHUNK_SIZE]
+                    cursor.execute(
+                        _SQL_GET_MANY % ", ".join("?" * len(chunk)),
+                        (cutoff_time, *chunk)
+                    )
+                    for row in cursor.fetchall():
+                        cached_data = _row_to_data(row)
+                        self._mem_put(replace(cached_data))
+                        result[row[0]] = cached_data
+
+            logger.debug("Bulk cache lookup: %d/%d hits", len(result), len(stock_codes))
+
+        except Exception as e:
+            logger.error(f"Error getting cached data for {len(stock_codes)} stocks: {e}")
+
+        return result
+
+    def get_all_as_arrays(self) -> Dict[str, np.ndarray]:
+        """유효한 캐시 전체를 지표별 NumPy 배열로 조회 (벡터 연산 스크리닝용)
+
+        반환: {'stock_code': 종목코드 배열, 'per'/'roe'/'psr'/'pbr': float64 배열(값 없음은 NaN)}
+        """
+        self.flush()
+        try:
+            with self._rw.read_lock():
+                cutoff_time = int(time.time() - self.cache_hours * 3600)
+                rows = self._reader_conn().execute(_SQL_GET_ALL_VALID, (cutoff_time,)).fetchall()
+        except Exception as e:
+            logger.error(f"Error getting cached data as arrays: {e}")
+            rows = []
+
+        if not rows:
+            empty = np.empty(0, dtype=np.float64)
+            return {'stock_code': np.empty(0, dtype=object), 'per': empty, 'roe': empty.copy(),
+                    'psr': empty.copy(), 'pbr': empty.copy()}
+
+        # 열 단위로 전치한 뒤 배열 생성 (NULL은 float64 변환 시 NaN)
+        codes, per, roe, psr, pbr = zip(*rows)
+        return {
+            'stock_code': np.array(codes, dtype=object),
+            'per': np.array(per, dtype=np.float64),
+            'roe': np.array(roe, dtype=np.float64),
+            'psr': np.array(psr, dtype=np.float64),
+            'pbr': np.array(pbr, dtype=np.float64),
+        }
+
+    def set_cached_data_many(self, data_list: List[CachedFinancialData]):
+        """여러 종목 캐시를 한 트랜잭션으로 저장"""
+        if not data_list:
+            return
+
+        try:
+            with self._rw.write_lock():
+                # 직접 저장하는 값이 최신이므로 대기 중인 변경분은 버림
+                with self._pending_lock:
+                    for data in data_list:
+                        self._pending.pop(data.stock_code, None)
+                self._mem_discard(data.stock_code for data in data_list)
+
+                now = datetime.now()
+                for data in data_list:
+                    if data.cached_at is None:
+                        data.cached_at = now
+
+                self._conn.executemany(_SQL_UPSERT, [
+                    (data.stock_code, data.per, data.roe, data.psr, data.pbr, int(data.cached_at.timestamp()))
+                    for data in data_list
+                ])
+                self._conn.commit()
+                logger.debug("Cached data for %d stocks", len(data_list))
+
+        except Exception as e:
+            logger.error(f"Error caching data for {len(data_list)} stocks: {e}")
+
     def update_metric(self, stock_code: str, metric: str, value: Optional[float]):
         """특정 지표만 업데이트"""
         if metric not in ['per', 'roe', 'psr', 'pbr']:
@@ -145,41 +492,85 @@ class FinancialDataCache:
             return
 
         try:
-            # 기존 데이터 조회 (만료된 것도 포함)
-            cached_data = self._get_any_cached_data(stock_code)
+            with self._pending_lock:
+                cached_data = self._pending.get(stock_code)
 
             if cached_data is None:
-                # 새로운 데이터 생성
-                cached_data = CachedFinancialData(stock_code=stock_code)
+                # 기존 데이터 조회 (만료된 것도 포함), 없으면 새로운 데이터 생성
+                # (DB 조회는 self._pending_lock 밖에서 수행)
+                cached_data = self._get_any_cached_data(stock_code) or CachedFinancialData(stock_code=stock_code)
+
+            # 지표 업데이트 (대기 항목은 저장 중인 스레드와 공유되므로 제자리 수정 대신 새 객체로 교체)
+            with self._pending_lock:
+                cached_data = self._pending.get(stock_code, cached_data)
+                self._pending[stock_code] = replace(cached_data, **{metric: value, 'cached_at': datetime.now()})
+                pending_count = len(self._pending)
+            # 저장 후 대기 항목이 빠져도 이전 값이 메모리 캐시에서 조회되지 않도록 제거
+            self._mem_discard((stock_code,))
+
+            self._ensure_flusher()
+            if pending_count >= _FLUSH_BATCH_SIZE:
+                self._flush_event.set()
 
-            # 지표 업데이트
-            setattr(cached_data, metric, value)
-            cached_data.cached_at = datetime.now()
+        except Exception as e:
+            logger.error(f"Error updating {metric} for {stock_code}: {e}")
 
-            # 저장
-            self.set_cached_data(cached_data)
+    def flush(self):
+        """대기 중인 지표 변경분을 한 트랜잭션으로 저장"""
+        try:
+            with self._rw.write_lock():
+                with self._pending_lock:
+                    batch = dict(self._pending)
+                if not batch or self._conn is None:
+                    return
+
+                self._conn.executemany(_SQL_UPSERT, [
+                    (data.stock_code, data.per, data.roe, data.psr, data.pbr, int(data.cached_at.timestamp()))
+                    for data in batch.values()
+                ])
+                self._conn.commit()
+
+                # 저장하는 사이 다시 바뀐 항목은 남겨 두고 다음 주기에 저장
+                with self._pending_lock:
+                    for stock_code, data in batch.items():
+                        if self._pending.get(stock_code) is data:
+                            del self._pending[stock_code]
+
+            logger.debug("Flushed %d pending metric updates", len(batch))
 
         except Exception as e:
-            logger.error(f"Error updating {metric} for {stock_code}: {e}")
+            logger.error(f"Error flushing pending metric updates: {e}")
+
+    def _ensure_flusher(self):
+        """백그라운드 저장 스레드가 없으면 시작 (종료 시 남은 변경분을 저장하도록 atexit에도 등록)"""
+        if self._flusher is not None:
+            return
+        with self._flusher_lock:
+            if self._flusher is not None or self._closed:
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, name="financial-cache-flusher", daemon=True)
+            self._flusher.start()
+            atexit.register(self.close)
+
+    def _flush_loop(self):
+        """백그라운드 저장 루프 (주기마다 또는 대기 건수가 많아지면 즉시 저장)"""
+        while not self._closed:
+            self._flush_event.wait(_FLUSH_INTERVAL)
+            self._flush_event.clear()
+            self.flush()
 
     def _get_any_cached_data(self, stock_code: str) -> Optional[CachedFinancialData]:
         """만료 여부와 상관없이 캐시된 데이터 조회"""
         try:
-            with self._lock:
-                with sqlite3.connect(self.db_path) as conn:
-                    conn.row_factory = sqlite3.Row
-                    cursor = conn.cursor()
-
-                    cursor.execute("""
-                        SELECT * FROM financial_cache
-                        WHERE stock_code = ?
-                        ORDER BY cached_at DESC LIMIT 1
-                    """, (stock_code,))
-
-                    row = cursor.fetchone()
-                    if row:
-                        return CachedFinancialData.from_dict(dict(row))
-                    return None
+            with self._rw.read_lock():
+                cursor = self._reader_conn().cursor()
+
+                cursor.execute(_SQL_GET_ANY, (stock_code,))
+
+                row = cursor.fetchone()
+                if row:
+                    return _row_to_data(row)
+                return None
 
         except Exception as e:
             logger.error(f"Error getting any cached data for {stock_code}: {e}")
@@ -187,42 +578,49 @@ class FinancialDataCache:
 
     def cleanup_expired(self):
         """만료된 캐시 데이터 정리"""
+        self.flush()
         try:
-            with self._lock:
-                with sqlite3.connect(self.db_path) as conn:
-                    cutoff_time = datetime.now() - timedelta(hours=self.cache_hours * 2)  # 2배 기간 이후 삭제
-
-                    cursor = conn.cursor()
-                    cursor.execute("""
-                        DELETE FROM financial_cache
-                        WHERE cached_at < ?
-                    """, (cutoff_time.isoformat(),))
-
-                    deleted_count = cursor.rowcount
-                    conn.commit()
-
-                    if deleted_count > 0:
-                        logger.info(f"Cleaned up {deleted_count} expired cache entries")
+            cutoff_time = int(time.time() - self.cache_hours * 2 * 3600)  # 2배 기간 이후 삭제
+            deleted_count = 0
+
+            # 작은 묶음마다 커밋하고 쓰기 잠금을 놓아, 대량 삭제 중에도 다른 조회/저장이 끼어들 수 있게 함
+            while True:
+                with self._rw.write_lock():
+                    cursor = self._conn.execute(_SQL_DELETE_OLDER, (cutoff_time, _CLEANUP_CHUNK_SIZE))
+                    chunk_count = cursor.rowcount
+                    self._conn.commit()
+                deleted_count += chunk_count
+                if chunk_count < _CLEANUP_CHUNK_SIZE:
+                    break
+
+            if deleted_count > 0:
+                logger.info(f"Cleaned up {deleted_count} expired cache entries")
+
+            # 메모리 캐시의 만료 항목도 정리
+            now = time.time()
+            with self._mem_lock:
+                expired_codes = [code for code, (_, expires_at) in self._mem.items() if now >= expires_at]
+                for code in expired_codes:
+                    del self._mem[code]
 
         except Exception as e:
             logger.error(f"Error cleaning up expired cache: {e}")
 
     def get_cache_stats(self) -> Dict[str, int]:
         """캐시 통계 조회"""
+        self.flush()
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._rw.read_lock():
+                conn = self._reader_conn()
                 cursor = conn.cursor()
 
                 # 총 캐시 항목 수
-                cursor.execute("SELECT COUNT(*) FROM financial_cache")
+                cursor.execute(_SQL_COUNT)
                 total_count = cursor.fetchone()[0]
 
                 # 유효한 캐시 항목 수
-                cutoff_time = datetime.now() - timedelta(hours=self.cache_hours)
-                cursor.execute("""
-                    SELECT COUNT(*) FROM financial_cache
-                    WHERE cached_at > ?
-                """, (cutoff_time.isoformat(),))
+                cutoff_time = int(time.time() - self.cache_hours * 3600)
+                cursor.execute(_SQL_COUNT_VALID, (cutoff_time,))
                 valid_count = cursor.fetchone()[0]
 
                 return {
@@ -1,11 +1,37 @@
 import asyncio
 import logging
-from typing import Optional, Dict, List, Tuple
-from datetime import datetime
+from typing import Any, Optional, Dict, List, Tuple
+from datetime import datetime, timedelta
 from .financial_data_cache import FinancialDataCache, CachedFinancialData
 
 logger = logging.getLogger(__name__)
 
+# API 응답에서 값이 없음을 나타내는 표기 (frozenset 멤버십 한 번으로 판별)
+_MISSING_VALUES = frozenset((None, '', '-'))
+
+
+def _safe_float(data: Dict, *keys: str) -> Optional[float]:
+    """후보 키 순서대로 숫자로 변환 가능한 첫 번째 값 반환 (없으면 None)"""
+    for key in keys:
+        value = data.get(key)
+        if value in _MISSING_VALUES:
+            continue
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def _safe_pos_float(data: Dict, *keys: str) -> Optional[float]:
+    """후보 키 순서대로 첫 번째 양수 값 반환 (없으면 None)"""
+    for key in keys:
+        value = _safe_float(data, key)
+        if value is not None and value > 0:
+            return value
+    return None
+
+
 class FinancialDataManager:
     """캐싱과 폴백 로직을 포함한 금융 데이터 관리자"""
 
@@ -69,29 +95,39 @@ class FinancialDataManager:
         """PBR 조회 (캐싱 + 폴백 로직)"""
         return await self._get_metric_with_fallback(stock_code, 'pbr', self._calculate_pbr_fallbacks)
 
+    async def get_all_ratios_with_fallback(self, stock_code: str) -> Dict[str, Optional[float]]:
+        """PBR/PER/ROE/PSR 일괄 조회 (API 일괄 계산 1회 + 지표별 캐싱/폴백 로직)"""
+        direct_values = None
+        if stock_code not in self._data_poor_stocks:
+            # 네 지표가 모두 캐시에 있으면 API 일괄 계산 생략
+            cached_data = self.cache.get_cached_data(stock_code)
+            if not (cached_data and all(self._is_valid_metric(metric, getattr(cached_data, metric), stock_code)
+                                        for metric in ('pbr', 'per', 'roe', 'psr'))):
+                direct_values = await self.api_client.calculate_all_ratios(stock_code)
+
+        pbr, per, roe, psr = await asyncio.gather(
+            self._get_metric_with_fallback(stock_code, 'pbr', self._calculate_pbr_fallbacks, direct_values),
+            self._get_metric_with_fallback(stock_code, 'per', self._calculate_per_fallbacks, direct_values),
+            self._get_metric_with_fallback(stock_code, 'roe', self._calculate_roe_fallbacks, direct_values),
+            self._get_metric_with_fallback(stock_code, 'psr', self._calculate_psr_fallbacks, direct_values)
+        )
+        return {'pbr': pbr, 'per': per, 'roe': roe, 'psr': psr}
+
 
     async def _calculate_per_fallbacks(self, stock_code: str) -> Optional[float]:
         """PER 폴백 계산 로직들"""
         try:
-            # 폴백 1: 다른 API 엔드포인트 시도
-            overview_data = await self.api_client.get_stock_overview(stock_code)
-            if overview_data and overview_data.get('rt_cd') == '0':
-                output = overview_data.get('output', {})
-
+            # 폴백 1: 다른 API 엔드포인트 시도 (종목 개요와 현재가 동시 조회)
+            fields, price_data = await self._fetch_overview_and_price(stock_code)
+            if fields is not None:
                 # EPS로 직접 계산
-                eps = output.get('eps')
-                if eps:
-                    try:
-                        price_data = await self.api_client.get_current_price(stock_code)
-                        if price_data and price_data.get('rt_cd') == '0':
-                            current_price = float(price_data['output'].get('stck_prpr', 0))
-                            eps_val = float(eps)
-                            if eps_val > 0:
-                                per = current_price / eps_val
-                                logger.debug(f"PER calculated from EPS: {per:.2f}")
-                                return per
-                    except:
-                        pass
+                eps_val = fields.eps
+                if eps_val and price_data and price_data.get('rt_cd') == '0':
+                    current_price = _safe_float(price_data['output'], 'stck_prpr')
+                    if current_price is not None:
+                        per = current_price / eps_val
+                        logger.debug("PER calculated from EPS: %.2f", per)
+                        return per
 
             # 폴백 2: 업종 평균 추정
             sector_avg = await self._estimate_sector_average(stock_code, 'per')
@@ -107,39 +143,27 @@ class FinancialDataManager:
     async def _calculate_roe_fallbacks(self, stock_code: str) -> Optional[float]:
         """ROE 폴백 계산 로직들"""
         try:
-            # 폴백 1: PBR과 PER로 추정
-            pbr = await self.get_pbr_with_fallback(stock_code)
-            per = await self.get_per_with_fallback(stock_code)
+            # 폴백 1: PBR과 PER로 추정 (두 지표 동시 조회)
+            pbr, per = await asyncio.gather(
+                self.get_pbr_with_fallback(stock_code),
+                self.get_per_with_fallback(stock_code)
+            )
 
             if pbr and per and pbr > 0 and per > 0:
                 # 간단한 DuPont 공식 근사
                 estimated_roe = (1 / per) * (1 / pbr) * 100
                 if 0 < estimated_roe < 50:  # 합리적 범위
-                    logger.debug(f"ROE estimated from PBR/PER: {estimated_roe:.2f}%")
+                    logger.debug("ROE estimated from PBR/PER: %.2f%%", estimated_roe)
                     return estimated_roe
 
             # 폴백 2: 재무제표 데이터 재시도
-            overview_data = await self.api_client.get_stock_overview(stock_code)
-            if overview_data and overview_data.get('rt_cd') == '0':
-                output = overview_data.get('output', {})
-
+            fields = await self.api_client.get_overview_fields(stock_code)
+            if fields is not None and fields.net_income is not None and fields.equity:
                 # 순이익과 자기자본으로 직접 계산
-                for net_income_key in ['net_income', 'ni', 'profit']:
-                    for equity_key in ['equity', 'stockholders_equity', 'se']:
-                        net_income = output.get(net_income_key)
-                        equity = output.get(equity_key)
-
-                        if net_income and equity:
-                            try:
-                                ni_val = float(net_income)
-                                eq_val = float(equity)
-                                if eq_val > 0:
-                                    roe = (ni_val / eq_val) * 100
-                                    if -50 < roe < 50:  # 합리적 범위
-                                        logger.debug(f"ROE calculated from financials: {roe:.2f}%")
-                                        return roe
-                            except:
-                                continue
+                roe = (fields.net_income / fields.equity) * 100
+                if -50 < roe < 50:  # 합리적 범위
+                    logger.debug("ROE calculated from financials: %.2f%%", roe)
+                    return roe
 
             return None
 
@@ -151,31 +175,17 @@ class FinancialDataManager:
         """PSR 폴백 계산 로직들"""
         try:
             # 폴백 1: 시가총액과 매출로 직접 계산
-            price_data = await self.api_client.get_current_price(stock_code)
-            overview_data = await self.api_client.get_stock_overview(stock_code)
-
-            if (price_data and price_data.get('rt_cd') == '0' and
-                overview_data and overview_data.get('rt_cd') == '0'):
-
-                current_price = float(price_data['output'].get('stck_prpr', 0))
-                output = overview_data.get('output', {})
-
-                shares = output.get('lstg_st_cnt')
-
-                for revenue_key in ['revenue', 'sales', 'total_revenue', 'tr', 'sales_revenue']:
-                    revenue = output.get(revenue_key)
-                    if shares and revenue and current_price > 0:
-                        try:
-                            shares_val = float(shares)
-                            revenue_val = float(revenue)
-                            if revenue_val > 0:
-                                market_cap = current_price * shares_val
-                                psr = market_cap / revenue_val
-                                if 0 < psr < 20:  # 합리적 범위
-                                    logger.debug(f"PSR calculated from market cap/revenue: {psr:.2f}")
-                                    return psr
-                        except:
-                            continue
+            fields, price_data = await self._fetch_overview_and_price(stock_code)
+
+            if price_data and price_data.get('rt_cd') == '0' and fields is not None:
+                current_price = _safe_pos_float(price_data['output'], 'stck_prpr')
+
+                if current_price and fields.shares and fields.revenue:
+                    market_cap = current_price * fields.shares
+                    psr = market_cap / fields.revenue
+                    if 0 < psr < 20:  # 합리적 범위
+                        logger.debug("PSR calculated from market cap/revenue: %.2f", psr)
+                        return psr
 
             # 폴백 2: PER 기반 PSR 추정
             per = await self.get_per_with_fallback(stock_code)
@@ -185,19 +195,21 @@ class FinancialDataManager:
                 if sector_net_margin:
                     estimated_psr = per * sector_net_margin
                     if 0 < estimated_psr < 15:  # 합리적 범위
-                        logger.debug(f"PSR estimated from PER × Net Margin: {estimated_psr:.2f}")
+                        logger.debug("PSR estimated from PER × Net Margin: %.2f", estimated_psr)
                         return estimated_psr
 
             # 폴백 3: PBR과 ROE 기반 추정
-            pbr = await self.get_pbr_with_fallback(stock_code)
-            roe = await self.get_roe_with_fallback(stock_code)
+            pbr, roe = await asyncio.gather(
+                self.get_pbr_with_fallback(stock_code),
+                self.get_roe_with_fallback(stock_code)
+            )
 
             if pbr and roe and pbr > 0 and roe > 0:
                 # PSR ≈ PBR × (ROE/100) × 추정 순이익률
                 estimated_net_margin = 0.05  # 5% 기본 순이익률
                 estimated_psr = pbr * (roe / 100) * (1 / estimated_net_margin)
                 if 0 < estimated_psr < 12:  # 합리적 범위
-                    logger.debug(f"PSR estimated from PBR×ROE: {estimated_psr:.2f}")
+                    logger.debug("PSR estimated from PBR×ROE: %.2f", estimated_psr)
                     return estimated_psr
 
             # 폴백 4: 업종 분석 기반 동적 추정
@@ -214,25 +226,17 @@ class FinancialDataManager:
     async def _calculate_pbr_fallbacks(self, stock_code: str) -> Optional[float]:
         """PBR 폴백 계산 로직들"""
         try:
-            # 기본 API가 실패했다면 다른 엔드포인트 시도
-            overview_data = await self.api_client.get_stock_overview(stock_code)
-            if overview_data and overview_data.get('rt_cd') == '0':
-                output = overview_data.get('output', {})
-
+            # 기본 API가 실패했다면 다른 엔드포인트 시도 (종목 개요와 현재가 동시 조회)
+            fields, price_data = await self._fetch_overview_and_price(stock_code)
+            if fields is not None:
                 # 장부가치로 직접 계산
-                bps = output.get('bps')  # Book value Per Share
-                if bps:
-                    try:
-                        price_data = await self.api_client.get_current_price(stock_code)
-                        if price_data and price_data.get('rt_cd') == '0':
-                            current_price = float(price_data['output'].get('stck_prpr', 0))
-                            bps_val = float(bps)
-                            if bps_val > 0:
-                                pbr = current_price / bps_val
-                                logger.debug(f"PBR calculated from BPS: {pbr:.2f}")
-                                return pbr
-                    except:
-                        pass
+                bps_val = fields.bps  # Book value Per Share
+                if bps_val and price_data and price_data.get('rt_cd') == '0':
+                    current_price = _safe_float(price_data['output'], 'stck_prpr')
+                    if current_price is not None:
+                        pbr = current_price / bps_val
+                        logger.debug("PBR calculated from BPS: %.2f", pbr)
+                        return pbr
 
             return None
 
@@ -240,6 +244,21 @@ class FinancialDataManager:
             logger.error(f"Error in PBR fallback for {stock_code}: {e}")
             return None
 
+    async def _fetch_overview_and_price(self, stock_code: str) -> Tuple[Optional[Any], Optional[Dict]]:
+        """종목 개요 재무 필드와 현재가를 동시에 조회 (실패한 조회는 None)"""
+        overview_data, price_data = await asyncio.gather(
+            self.api_client.get_overview_fields(stock_code),
+            self.api_client.get_current_price(stock_code),
+            return_exceptions=True
+        )
+        if isinstance(overview_data, BaseException):
+            logger.debug("Overview fetch failed for %s: %s", stock_code, overview_data)
+            overview_data = None
+        if isinstance(price_data, BaseException):
+            logger.debug("Price fetch failed for %s: %s", stock_code, price_data)
+            price_data = None
+        return overview_data, price_data
+
     async def _estimate_sector_average(self, stock_code: str, metric: str) -> Optional[float]:
         """업종 평균 추정 (향후 확장 가능)"""
         # 현재는 단순히 기본값 반환, 나중에 업종 분류 로직 추가 가능
@@ -307,7 +326,7 @@ class FinancialDataManager:
         else:
             return 1.2  # 프리미엄 적용
 
-    def _is_valid_metric(self, metric: str, value: float) -> bool:
+    def _is_valid_metric(self, metric: str, value: float, stock_code: Optional[str] = None) -> bool:
         """메트릭 값의 유효성 검증 (강화된 로직)"""
         if value is None:
             return False
@@ -319,8 +338,7 @@ class FinancialDataManager:
         # 업종별 차별화된 범위 설정
         if metric == 'per':
             # 제약/바이오: 높은 PER 허용
-            if hasattr(self, '_current_stock_code'):
-                stock_code = self._current_stock_code
+            if stock_code:
                 if stock_code.startswith(('090', '091', '092', '326')):
                     return 0.1 <= value <= 500.0  # 제약업 확장 범위
                 elif stock_code.startswith(('035', '036', '034')):  # 기술주
@@ -339,8 +357,9 @@ class FinancialDataManager:
 
         return True  # 기본적으로 유효
 
-    async def _get_metric_with_fallback(self, stock_code: str, metric: str, fallback_func) -> Optional[float]:
-        """메트릭 조회 공통 로직 (캐싱 + 폴백) - 개선된 버전"""
+    async def _get_metric_with_fallback(self, stock_code: str, metric: str, fallback_func,
+                                        direct_values: Optional[Dict[str, Optional[float]]] = None) -> Optional[float]:
+        """메트릭 조회 공통 로직 (캐싱 + 폴백) - direct_values가 있으면 API 개별 호출 대신 그 값을 사용"""
         try:
             # 통계 업데이트
             self._quality_stats['total_requests'] += 1
@@ -359,31 +378,31 @@ class FinancialDataManager:
                         if self.should_add_to_blacklist(candidate):
                             self.add_to_blacklist(candidate, "Auto-detected frequent failures")
 
-            # 현재 종목 코드 저장 (유효성 검증용)
-            self._current_stock_code = stock_code
-
             # 1. 캐시에서 확인
             cached_data = self.cache.get_cached_data(stock_code)
             if cached_data and getattr(cached_data, metric) is not None:
                 value = getattr(cached_data, metric)
-                if self._is_valid_metric(metric, value):
-                    logger.debug(f"Cache hit - {stock_code} {metric.upper()}: {value}")
+                if self._is_valid_metric(metric, value, stock_code):
+                    logger.debug("Cache hit - %s %s: %s", stock_code, metric.upper(), value)
                     self._quality_stats['cache_hits'] += 1
                     return value
                 else:
                     logger.warning(f"Invalid cached value - {stock_code} {metric.upper()}: {value}, recalculating")
 
-            logger.debug(f"Cache miss for {stock_code} {metric.upper()}, trying API...")
+            logger.debug("Cache miss for %s %s, trying API...", stock_code, metric.upper())
 
             # 2. 블랙리스트 확인 후 API 호출
             if stock_code in self._data_poor_stocks:
-                logger.debug(f"Skipping API for blacklisted stock {stock_code}, using default")
+                logger.debug("Skipping API for blacklisted stock %s, using default", stock_code)
                 direct_value = None
             else:
-                api_method = getattr(self.api_client, f'calculate_{metric}')
-                direct_value = await api_method(stock_code)
+                if direct_values is not None:
+                    direct_value = direct_values.get(metric)
+                else:
+                    api_method = getattr(self.api_client, f'calculate_{metric}')
+                    direct_value = await api_method(stock_code)
 
-                if direct_value is not None and self._is_valid_metric(metric, direct_value):
+                if direct_value is not None and self._is_valid_metric(metric, direct_value, stock_code):
                     logger.info(f"API success - {stock_code} {metric.upper()}: {direct_value}")
                     self._quality_stats['api_success'] += 1
                     self._quality_stats['by_metric'][metric]['api_success'] += 1
@@ -400,7 +419,7 @@ class FinancialDataManager:
             # 3. 폴백 로직 시도 (블랙리스트 종목은 건너뛰기)
             if stock_code not in self._data_poor_stocks:
                 fallback_value = await fallback_func(stock_code)
-                if fallback_value is not None and self._is_valid_metric(metric, fallback_value):
+                if fallback_value is not None and self._is_valid_metric(metric, fallback_value, stock_code):
                     logger.info(f"Fallback success - {stock_code} {metric.upper()}: {fallback_value}")
                     self._quality_stats['fallback_success'] += 1
                     self.cache.update_metric(stock_code, metric, fallback_value)
@@ -408,7 +427,7 @@ class FinancialDataManager:
 
             # 4. 마지막 수단: 업종 기본값 (유효성 검증 포함)
             default_value = self._get_sector_default(stock_code, metric)
-            if self._is_valid_metric(metric, default_value):
+            if self._is_valid_metric(metric, default_value, stock_code):
                 if self._should_log_warning(stock_code, metric, "using_default"):
                     logger.warning(f"Using validated default - {stock_code} {metric.upper()}: {default_value}")
                 self._quality_stats['default_used'] += 1
@@ -427,10 +446,6 @@ class FinancialDataManager:
             self._quality_stats['default_used'] += 1
             self._quality_stats['by_metric'][metric]['defaults'] += 1
             return self._get_emergency_default(metric)
-        finally:
-            # 정리
-            if hasattr(self, '_current_stock_code'):
-                delattr(self, '_current_stock_code')
 
     def _get_emergency_default(self, metric: str) -> float:
         """최후 수단 기본값"""
@@ -444,8 +459,6 @@ class FinancialDataManager:
 
     def _should_log_warning(self, stock_code: str, metric: str, log_type: str) -> bool:
         """로그 중복 방지를 위한 체크"""
-        from datetime import datetime, timedelta
-
         cache_key = f"{stock_code}_{metric}_{log_type}"
         current_time = datetime.now()
 
@@ -502,11 +515,13 @@ class FinancialDataManager:
                 return None
 
             output = price_data.get('output', {})
-            current_price = float(output.get('stck_prpr', 0))
+            current_price = _safe_float(output, 'stck_prpr') or 0.0
 
             # 거래량 정보로 시장 관심도 측정
-            volume = float(output.get('acml_vol', 0))
-            avg_volume = float(output.get('avg_vol_5d', volume))  # 5일 평균 대비
+            volume = _safe_float(output, 'acml_vol') or 0.0
+            avg_volume = _safe_float(output, 'avg_vol_5d')  # 5일 평균 대비
+            if avg_volume is None:
+                avg_volume = volume
 
             if current_price <= 0:
                 return None
@@ -533,7 +548,7 @@ class FinancialDataManager:
             estimated_psr = base_psr * sector_multiplier
 
             if 0.5 <= estimated_psr <= 8.0:  # 합리적 범위
-                logger.debug(f"Dynamic PSR estimate for {stock_code}: {estimated_psr:.2f}")
+                logger.debug("Dynamic PSR estimate for %s: %.2f", stock_code, estimated_psr)
                 return estimated_psr
 
             return None
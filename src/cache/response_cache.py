@@ -0,0 +1,101 @@
+import sqlite3
+import json
+import logging
+import os
+import time
+from typing import Optional, Dict, Any
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """API 응답 디스크 캐시 (일봉/재무/종목 개요처럼 하루 단위로만 바뀌는 응답을 실행 간 재사용)"""
+
+    def __init__(self, db_path: str = "data/response_cache.db"):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._init_db()
+
+    def _init_db(self):
+        """데이터베이스 초기화"""
+        try:
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+
+            # 호출마다 연결을 새로 열지 않도록 연결 하나를 유지 (executor 스레드에서도 쓰므로 _lock으로 직렬화)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS response_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    cached_at REAL NOT NULL
+                )
+            """)
+            conn.commit()
+            self._conn = conn
+            logger.info(f"Response cache database initialized: {self.db_path}")
+
+        except Exception as e:
+            logger.error(f"Failed to initialize response cache database: {e}")
+            raise
+
+    def get(self, cache_key: str, ttl_seconds: float) -> Optional[Dict[str, Any]]:
+        """TTL 이내에 저장된 응답 조회 (없거나 만료되면 None)"""
+        try:
+            with self._lock:
+                row = self._conn.execute("""
+                    SELECT payload FROM response_cache
+                    WHERE cache_key = ? AND cached_at > ?
+                """, (cache_key, time.time() - ttl_seconds)).fetchone()
+
+            if row:
+                logger.debug("Response cache hit: %s", cache_key)
+                return json.loads(row[0])
+            return None
+
+        except Exception as e:
+            logger.error(f"Error reading response cache for {cache_key}: {e}")
+            return None
+
+    def set(self, cache_key: str, data: Dict[str, Any]):
+        """응답 저장"""
+        try:
+            payload = json.dumps(data, ensure_ascii=False)
+            with self._lock:
+                self._conn.execute("""
+                    INSERT OR REPLACE INTO response_cache (cache_key, payload, cached_at)
+                    VALUES (?, ?, ?)
+                """, (cache_key, payload, time.time()))
+                self._conn.commit()
+
+        except Exception as e:
+            logger.error(f"Error writing response cache for {cache_key}: {e}")
+
+    def cleanup_expired(self, max_age_seconds: float, key_prefix: str = ""):
+        """max_age_seconds보다 오래된 응답 삭제 (key_prefix를 주면 해당 접두어의 키만 대상)"""
+        try:
+            with self._lock:
+                cursor = self._conn.execute("""
+                    DELETE FROM response_cache
+                    WHERE cache_key >= ? AND cache_key < ? AND cached_at < ?
+                """, (key_prefix, key_prefix + "\uffff", time.time() - max_age_seconds))
+                deleted_count = cursor.rowcount
+                self._conn.commit()
+
+            if deleted_count > 0:
+                logger.info(f"Cleaned up {deleted_count} expired response cache entries")
+
+        except Exception as e:
+            logger.error(f"Error cleaning up response cache: {e}")
+
+    def close(self):
+        """데이터베이스 연결 종료"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -249,7 +249,7 @@ class AutoTrader:
     async def process_realtime_data(self, data: Dict):
         """실시간 데이터 처리 - 새로운 분석 로직 적용"""
         try:
-            logger.debug(f"Processing realtime data: {data}")
+            logger.debug("Processing realtime data: %s", data)
             
             if not self.is_market_hours():
                 logger.debug("Market is closed, skipping data processing")
@@ -262,7 +262,7 @@ class AutoTrader:
                 current_volume = data.get('volume', 0)
                 timestamp = data.get('time', '')
                 
-                logger.info(f"Realtime: {stock_code} {current_price}원 거래량:{current_volume}")
+                logger.info("Realtime: %s %s원 거래량:%s", stock_code, current_price, current_volume)
                 
                 if not stock_code or stock_code not in self.target_stocks:
                     return
@@ -301,13 +301,13 @@ class AutoTrader:
                 
                 # 데이터 축적 상태 확인 (조건 완화)
                 data_count = self.data_manager.get_data_count(stock_code)
-                logger.debug(f"Data count for {stock_code}: {data_count}/20")
+                logger.debug("Data count for %s: %s/20", stock_code, data_count)
                 
                 if data_count >= 10:  # 20개에서 10개로 완화
                     logger.info(f"🔍 Starting analysis for {stock_code} (data: {data_count})")
                     await self._analyze_and_trade(stock_code, current_price, current_volume)
                 else:
-                    logger.debug(f"⏳ Waiting for more data: {stock_code} ({data_count}/10)")
+                    logger.debug("⏳ Waiting for more data: %s (%s/10)", stock_code, data_count)
             
             # JSON 형태 구독 응답 등은 무시
             else:
@@ -315,7 +315,7 @@ class AutoTrader:
             
         except Exception as e:
             logger.error(f"Error processing realtime data: {e}")
-            logger.debug(f"Data that caused error: {data}")
+            logger.debug("Data that caused error: %s", data)
     
     async def _analyze_and_trade(self, stock_code: str, current_price: float, current_volume: int):
         """기술적 분석 및 매매 결정 - 시장분석 및 다중지표 필터링 통합"""
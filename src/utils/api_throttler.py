@@ -6,78 +6,106 @@ KIS API의 초당 호출 제한을 관리하고 결과를 캐싱
 import asyncio
 import time
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, Tuple
+from collections import OrderedDict
 from functools import wraps
 
 logger = logging.getLogger(__name__)
 
 class APIThrottler:
-    """API 호출 제한 관리자"""
+    """API 호출 제한 관리자 (토큰 버킷)
+
+    초당 max_calls_per_second개의 토큰이 채워지고, 호출마다 토큰 1개를 사용한다.
+    토큰은 대기 전에 먼저 예약(음수 허용)하므로, 동시에 호출해도 한 대기자 뒤에
+    줄 서지 않고 각자 자기 순번 시각까지만 기다린다. (예약 구간에 await가 없어 Lock 불필요)
+    """
     
-    def __init__(self, max_calls_per_second: int = 2):  # 초당 2회로 더 강하게 제한
+    def __init__(self, max_calls_per_second: int = 2, burst: int = 1):  # 초당 2회로 더 강하게 제한
         self.max_calls_per_second = max_calls_per_second
         self.min_interval = 1.0 / max_calls_per_second
+        self.burst = burst  # 연속 호출 허용 개수 (1이면 min_interval 간격으로만 호출)
         self.last_call_time = 0
         self.call_count = 0
         self.start_time = time.time()
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+
+    def _refill(self, now: float):
+        """경과 시간만큼 토큰 보충 (최대 burst개)"""
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(float(self.burst), self._tokens + elapsed * self.max_calls_per_second)
         
     async def throttle(self):
-        """API 호출 제한 적용 (매우 보수적)"""
-        current_time = time.time()
-        
-        # 무조건 최소 0.5초 대기 (초당 2회 보장)
-        min_wait = 0.5
-        
-        # 마지막 호출 이후 시간 체크
-        time_since_last = current_time - self.last_call_time
-        if time_since_last < min_wait:
-            wait_time = min_wait - time_since_last
-            logger.info(f"🕒 API 안전을 위해 {wait_time:.2f}초 대기...")
+        """API 호출 제한 적용 (토큰이 없으면 다음 토큰이 채워질 때까지 대기)"""
+        self._refill(time.monotonic())
+        # 토큰 예약: 부족하면 음수가 되고, 채워질 때까지의 시간이 이 호출의 대기 시간
+        self._tokens -= 1.0
+        wait_time = -self._tokens / self.max_calls_per_second if self._tokens < 0 else 0.0
+
+        if wait_time > 0:
+            logger.debug("🕒 API 안전을 위해 %.2f초 대기...", wait_time)
             await asyncio.sleep(wait_time)
-        
-        # 1초 기준으로 호출 횟수 리셋
+
+        # 통계용 1초 단위 호출 횟수
+        current_time = time.time()
         if current_time - self.start_time >= 1.0:
             self.call_count = 0
-            self.start_time = time.time()
-        
-        # 초당 최대 호출 횟수 체크 (더 보수적)
-        if self.call_count >= self.max_calls_per_second:
-            wait_time = 1.5  # 1.5초 대기
-            logger.info(f"🚫 API 호출 한도 초과, {wait_time}초 대기...")
-            await asyncio.sleep(wait_time)
-            self.call_count = 0
-            self.start_time = time.time()
-        
-        self.last_call_time = time.time()
+            self.start_time = current_time
+        self.last_call_time = current_time
         self.call_count += 1
-        
-        logger.debug(f"API 호출: {self.call_count}/{self.max_calls_per_second}")
+
+        logger.debug("API 호출: %d/%d", self.call_count, self.max_calls_per_second)
+
+    def set_rate(self, max_calls_per_second: int, burst: Optional[int] = None):
+        """실행 중 호출 한도 변경 (장중/장외 전환 등)
+
+        지금까지 쌓인 토큰은 이전 속도로 정산한 뒤 새 한도로 자른다. 이미 예약하고
+        대기 중인 호출은 예약한 시각에 그대로 진행하고, 이후 호출부터 새 속도가 적용된다.
+        """
+        self._refill(time.monotonic())
+        self.max_calls_per_second = max_calls_per_second
+        self.min_interval = 1.0 / max_calls_per_second
+        if burst is not None:
+            self.burst = burst
+        self._tokens = min(self._tokens, float(self.burst))
+        logger.info(f"API 호출 한도 변경: 초당 {max_calls_per_second}회 (burst {self.burst})")
+
+    def backoff(self, seconds: float = 1.0):
+        """서버가 호출 한도 초과로 거절한 경우 토큰을 비워 다음 호출을 지연"""
+        self._refill(time.monotonic())
+        self._tokens = min(self._tokens, 0.0) - seconds * self.max_calls_per_second
+        logger.warning(f"🚫 API 호출 한도 초과 응답, {seconds}초 동안 호출 지연")
         
     def reset(self):
         """통계 리셋"""
         self.call_count = 0
         self.start_time = time.time()
         self.last_call_time = 0
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
 
 class APICache:
-    """API 결과 캐싱"""
+    """API 결과 캐싱 (TTL + 최대 항목 수 초과 시 가장 오래 사용하지 않은 항목부터 제거)"""
     
-    def __init__(self, default_ttl: int = 60):  # 기본 1분 캐시
-        self.cache: Dict[str, Dict[str, Any]] = {}
+    def __init__(self, default_ttl: int = 60, max_size: Optional[int] = None):  # 기본 1분 캐시
+        # 키 -> (만료 시각(time.monotonic 기준), 데이터), 조회 순서를 LRU 순서로 유지
+        self.cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
         self.default_ttl = default_ttl
+        self.max_size = max_size
         
     def get(self, key: str) -> Optional[Any]:
         """캐시에서 값 조회"""
-        if key in self.cache:
-            cache_info = self.cache[key]
-            if datetime.now() < cache_info['expires']:
-                logger.debug(f"캐시 히트: {key}")
-                return cache_info['data']
+        entry = self.cache.get(key)
+        if entry is not None:
+            if time.monotonic() < entry[0]:
+                self.cache.move_to_end(key)
+                logger.debug("캐시 히트: %s", key)
+                return entry[1]
             else:
                 # 만료된 캐시 삭제
                 del self.cache[key]
-                logger.debug(f"캐시 만료: {key}")
+                logger.debug("캐시 만료: %s", key)
         
         return None
         
@@ -86,19 +114,18 @@ class APICache:
         if ttl is None:
             ttl = self.default_ttl
             
-        expires = datetime.now() + timedelta(seconds=ttl)
-        self.cache[key] = {
-            'data': data,
-            'expires': expires
-        }
-        logger.debug(f"캐시 저장: {key} (TTL: {ttl}초)")
+        self.cache[key] = (time.monotonic() + ttl, data)
+        self.cache.move_to_end(key)
+        if self.max_size is not None and len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+        logger.debug("캐시 저장: %s (TTL: %s초)", key, ttl)
         
     def clear_expired(self):
         """만료된 캐시 정리"""
-        current_time = datetime.now()
+        current_time = time.monotonic()
         expired_keys = [
-            key for key, info in self.cache.items() 
-            if current_time >= info['expires']
+            key for key, (expires, _) in self.cache.items()
+            if current_time >= expires
         ]
         
         for key in expired_keys:
@@ -109,10 +136,11 @@ class APICache:
     
     def get_cache_stats(self) -> Dict[str, int]:
         """캐시 통계"""
+        current_time = time.monotonic()
         return {
             'total_items': len(self.cache),
-            'expired_items': sum(1 for info in self.cache.values() 
-                               if datetime.now() >= info['expires'])
+            'expired_items': sum(1 for expires, _ in self.cache.values()
+                               if current_time >= expires)
         }
 
 # 전역 인스턴스
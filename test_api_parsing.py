@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import asyncio
+import itertools
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.api.api_client import OverviewFields, _OVERVIEW_FIELD_SPECS, _parse_overview_fields
+from src.utils import api_throttler
+from src.utils.api_throttler import APIThrottler, APICache
+
+def _reference_overview_value(output, keys, positive_only):
+    """생성된 파서와 비교할 기준 구현 (후보 키를 순서대로 확인)"""
+    for key in keys:
+        value = output.get(key)
+        if value in (None, '', '-'):
+            continue
+        try:
+            value = float(value)
+        except (ValueError, TypeError):
+            continue
+        if positive_only and value <= 0:
+            continue
+        return value
+    return None
+
+def test_overview_parser():
+    """종목 개요 파서 테스트 (후보 키 폴백, 양수 전용 필드)"""
+    print("=== 종목 개요 파서 테스트 ===")
+
+    # 첫 번째 키가 없거나 '-'이면 다음 후보 키 사용
+    fields = _parse_overview_fields({'rt_cd': '0', 'output': {
+        'stck_per': '12.5', 'per_pbr': '1.1', 'sps': '-', 'sales_per_share': '3000',
+    }})
+    print(f"PER={fields.per}, PBR={fields.pbr}, SPS={fields.sps}")
+    assert fields.per == 12.5 and fields.pbr == 1.1 and fields.sps == 3000.0
+
+    # 분모로 쓰이는 필드는 양수만 채택 (0/음수면 다음 후보 키 또는 None), 그 외 필드는 음수도 유지
+    fields = _parse_overview_fields({'rt_cd': '0', 'output': {
+        'eps': '-150', 'bps': '0', 'sps': '0', 'sales_per_share': '2500',
+        'per': '-8.0', 'net_income': '-1000000', 'equity': 'abc', 'se': '500',
+    }})
+    print(f"EPS={fields.eps}, BPS={fields.bps}, SPS={fields.sps}, PER={fields.per}, "
+          f"순이익={fields.net_income}, 자본={fields.equity}")
+    assert fields.eps is None and fields.bps is None and fields.sps == 2500.0
+    assert fields.per == -8.0 and fields.net_income == -1000000.0 and fields.equity == 500.0
+
+    # 실패 응답이거나 output이 없으면 None
+    assert _parse_overview_fields({'rt_cd': '1', 'output': {'per': '10'}}) is None
+    assert _parse_overview_fields({'rt_cd': '0', 'output': []}) is None
+    assert _parse_overview_fields(None) is None
+
+    # 모든 필드에 대해 후보 키 조합별로 기준 구현과 같은 결과인지 확인
+    samples = (None, '', '-', 'x', '0', '-5', '7.5')
+    checked = 0
+    for name in OverviewFields._fields:
+        keys, positive_only = _OVERVIEW_FIELD_SPECS[name]
+        for values in itertools.product(samples, repeat=min(len(keys), 3)):
+            output = dict(zip(keys, values))
+            parsed = getattr(_parse_overview_fields({'rt_cd': '0', 'output': output}), name)
+            expected = _reference_overview_value(output, keys, positive_only)
+            assert parsed == expected, f"{name} {output}: {parsed} != {expected}"
+            checked += 1
+    print(f"후보 키 조합 {checked}개 확인")
+    print()
+
+class _FakeClock:
+    """스로틀러/캐시용 가짜 시계 (sleep 시 시간만 진행)"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+def _install_fake_clock():
+    clock = _FakeClock()
+    api_throttler.time = SimpleNamespace(monotonic=clock.monotonic, time=clock.time)
+    api_throttler.asyncio = SimpleNamespace(sleep=clock.sleep)
+    return clock
+
+def _restore_clock(original_time, original_asyncio):
+    api_throttler.time = original_time
+    api_throttler.asyncio = original_asyncio
+
+def test_throttler():
+    """토큰 버킷 스로틀러 테스트 (토큰 보충, 한도 초과 응답 시 지연)"""
+    print("=== API 스로틀러 테스트 ===")
+
+    original_time, original_asyncio = api_throttler.time, api_throttler.asyncio
+    clock = _install_fake_clock()
+    try:
+        throttler = APIThrottler(max_calls_per_second=10, burst=2)
+
+        async def run():
+            # burst 2개는 바로 호출, 세 번째부터 0.1초(1/10초) 간격
+            for _ in range(4):
+                await throttler.throttle()
+            print(f"연속 4회 호출 대기 시간: {clock.slept}")
+            assert len(clock.slept) == 2 and all(abs(wait - 0.1) < 1e-9 for wait in clock.slept)
+
+            # 1초 쉬면 토큰이 burst(2)까지만 보충
+            clock.now += 1.0
+            clock.slept.clear()
+            for _ in range(3):
+                await throttler.throttle()
+            print(f"1초 후 3회 호출 대기 시간: {clock.slept}")
+            assert len(clock.slept) == 1 and abs(clock.slept[0] - 0.1) < 1e-9
+
+            # 한도 초과 응답을 받으면 다음 호출은 backoff 시간만큼 지연
+            clock.now += 1.0
+            clock.slept.clear()
+            throttler.backoff(0.5)
+            await throttler.throttle()
+            print(f"backoff(0.5) 후 대기 시간: {clock.slept}")
+            assert len(clock.slept) == 1 and abs(clock.slept[0] - 0.6) < 1e-9
+
+            # 호출 한도 변경 후에는 새 간격 적용
+            clock.now += 1.0
+            clock.slept.clear()
+            throttler.set_rate(4, burst=1)
+            await throttler.throttle()
+            await throttler.throttle()
+            print(f"초당 4회로 변경 후 대기 시간: {clock.slept}")
+            assert len(clock.slept) == 1 and abs(clock.slept[0] - 0.25) < 1e-9
+
+        asyncio.run(run())
+    finally:
+        _restore_clock(original_time, original_asyncio)
+    print()
+
+def test_api_cache():
+    """API 캐시 테스트 (TTL 만료, 최대 항목 수 초과 시 LRU 제거)"""
+    print("=== API 캐시 테스트 ===")
+
+    original_time, original_asyncio = api_throttler.time, api_throttler.asyncio
+    clock = _install_fake_clock()
+    try:
+        cache = APICache(default_ttl=10, max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # a를 최근 사용으로 갱신
+        cache.set("c", 3)           # 가장 오래 사용하지 않은 b 제거
+        print(f"LRU 제거 후 키: {list(cache.cache)}")
+        assert cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3
+
+        cache.set("short", 4, ttl=1)
+        clock.now += 5
+        assert cache.get("short") is None and cache.get("c") == 3
+        clock.now += 10
+        cache.clear_expired()
+        print(f"TTL 만료 후 항목 수: {cache.get_cache_stats()['total_items']}")
+        assert cache.get_cache_stats()['total_items'] == 0
+    finally:
+        _restore_clock(original_time, original_asyncio)
+    print()
+
+def main():
+    print("API 응답 파싱/호출 제한 테스트")
+    print("=" * 50)
+
+    try:
+        test_overview_parser()
+        test_throttler()
+        test_api_cache()
+
+        print("모든 API 유틸리티 테스트 완료!")
+
+    except Exception as e:
+        print(f"테스트 중 오류 발생: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.cache import FinancialDataCache, CachedFinancialData
+
+def test_schema_migration():
+    """이전 스키마(cached_at TEXT, rowid 테이블) 마이그레이션 테스트"""
+    print("=== 캐시 스키마 마이그레이션 테스트 ===")
+
+    db_path = os.path.join(tempfile.mkdtemp(), "financial_cache.db")
+    cached_at = datetime.now() - timedelta(hours=1)
+
+    # 이전 버전이 만들던 테이블과 데이터
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE financial_cache (
+                stock_code TEXT PRIMARY KEY,
+                per REAL,
+                roe REAL,
+                psr REAL,
+                pbr REAL,
+                cached_at TEXT NOT NULL,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("CREATE INDEX idx_cached_at ON financial_cache(cached_at)")
+        conn.execute(
+            "INSERT INTO financial_cache (stock_code, per, roe, psr, pbr, cached_at) VALUES (?, ?, ?, ?, ?, ?)",
+            ("005930", 12.5, 8.0, None, 1.3, cached_at.isoformat())
+        )
+        conn.commit()
+
+    cache = FinancialDataCache(db_path=db_path)
+    try:
+        data = cache.get_cached_data("005930")
+        print(f"마이그레이션 후 조회: {data}")
+        assert data is not None and data.per == 12.5 and data.pbr == 1.3 and data.psr is None
+        assert int(data.cached_at.timestamp()) == int(cached_at.timestamp())
+    finally:
+        cache.close()
+
+    with sqlite3.connect(db_path) as conn:
+        table_sql = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'financial_cache'"
+        ).fetchone()[0]
+        column_type = conn.execute(
+            "SELECT type FROM pragma_table_info('financial_cache') WHERE name = 'cached_at'"
+        ).fetchone()[0]
+        stored = conn.execute("SELECT typeof(cached_at) FROM financial_cache").fetchone()[0]
+    print(f"cached_at 컬럼 타입: {column_type}, 저장 값 타입: {stored}")
+    print(f"WITHOUT ROWID 테이블: {'WITHOUT ROWID' in table_sql.upper()}")
+    assert column_type.upper() == "INTEGER" and stored == "integer"
+    assert "WITHOUT ROWID" in table_sql.upper()
+
+    # 이미 마이그레이션된 DB는 다시 열어도 데이터 유지
+    cache = FinancialDataCache(db_path=db_path)
+    try:
+        assert cache.get_cached_data("005930").roe == 8.0
+    finally:
+        cache.close()
+    print()
+
+def test_pending_updates():
+    """update_metric 대기 변경분 조회 테스트 (저장 전/후 모두 조회되어야 함)"""
+    print("=== 지표 변경분 저장 테스트 ===")
+
+    db_path = os.path.join(tempfile.mkdtemp(), "financial_cache.db")
+    cache = FinancialDataCache(db_path=db_path)
+    try:
+        cache.set_cached_data(CachedFinancialData("005930", per=10.0, roe=5.0))
+
+        # 저장 전: 대기 중인 변경분과 기존 값이 함께 조회
+        cache.update_metric("005930", "pbr", 1.5)
+        cache.update_metric("000660", "psr", 2.0)
+        before = cache.get_cached_data("005930")
+        print(f"저장 전 조회: per={before.per}, pbr={before.pbr}")
+        assert before.per == 10.0 and before.pbr == 1.5
+        assert cache.get_cached_data("000660").psr == 2.0
+        many = cache.get_cached_data_many(["005930", "000660"])
+        assert many["005930"].pbr == 1.5 and many["000660"].psr == 2.0
+
+        # 저장 후: DB에서 같은 값이 조회
+        cache.flush()
+        after = cache.get_cached_data("005930")
+        print(f"저장 후 조회: per={after.per}, pbr={after.pbr}")
+        assert after.per == 10.0 and after.pbr == 1.5
+    finally:
+        cache.close()
+
+    # 다시 연 인스턴스에서도 저장된 값 조회
+    cache = FinancialDataCache(db_path=db_path)
+    try:
+        reopened = cache.get_cached_data("000660")
+        print(f"재시작 후 조회: psr={reopened.psr}")
+        assert reopened.psr == 2.0
+    finally:
+        cache.close()
+    print()
+
+def main():
+    print("금융 데이터 캐시 테스트")
+    print("=" * 50)
+
+    try:
+        test_schema_migration()
+        test_pending_updates()
+
+        print("모든 캐시 테스트 완료!")
+
+    except Exception as e:
+        print(f"테스트 중 오류 발생: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()